@@ -19,6 +19,9 @@ from app.models.user import UserModel
 from app.models.task import TaskModel
 from app.models.document import DocumentModel
 from app.models.training import TrainingModuleModel, EmployeeTrainingModel
+from app.models.metrics import OnboardingMetricsModel
+from app.models.onboarding import OnboardingAnalysisModel
+from app.models.auth_session import AuthSessionModel
 from app.database import SQLModel
 
 # This is your MetaData object
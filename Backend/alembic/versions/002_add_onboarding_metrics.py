@@ -0,0 +1,38 @@
+"""Add onboarding metrics rollup table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-employee and global onboarding counters
+    op.create_table(
+        'onboarding_metrics',
+        sa.Column('scope', sa.String(length=64), primary_key=True),
+        sa.Column('tasks_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tasks_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tasks_pending', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('training_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('training_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('documents_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('documents_pending', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('documents_verified', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('documents_rejected', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('documents_failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('onboarding_metrics')
@@ -0,0 +1,37 @@
+"""Add background processing state to documents
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Processing state for the document pipeline
+    op.add_column('documents', sa.Column('processing_status', sa.String(length=20), nullable=False, server_default='QUEUED'))
+    op.add_column('documents', sa.Column('processing_attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('documents', sa.Column('processing_error', sa.Text(), nullable=True))
+    op.add_column('documents', sa.Column('processing_started_at', sa.DateTime(), nullable=True))
+    op.add_column('documents', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    
+    # Documents already analysed inline are done; the rest get picked up by recovery
+    op.execute("UPDATE documents SET processing_status = 'COMPLETED' WHERE ai_processed_at IS NOT NULL")
+    op.create_index('ix_documents_processing_status', 'documents', ['processing_status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_processing_status', table_name='documents')
+    op.drop_column('documents', 'next_attempt_at')
+    op.drop_column('documents', 'processing_started_at')
+    op.drop_column('documents', 'processing_error')
+    op.drop_column('documents', 'processing_attempts')
+    op.drop_column('documents', 'processing_status')
@@ -0,0 +1,30 @@
+"""Add stored onboarding analyses
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest AI onboarding analysis per employee, keyed by an input fingerprint
+    op.create_table(
+        'onboarding_analyses',
+        sa.Column('employee_id', sa.String(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('analysis', sa.Text(), nullable=False),
+        sa.Column('analyzed_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('onboarding_analyses')
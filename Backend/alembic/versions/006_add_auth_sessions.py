@@ -0,0 +1,35 @@
+"""Add refresh token sessions
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per login session; holds the hash of the current refresh token
+    op.create_table(
+        'auth_sessions',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_auth_sessions_user_id', 'auth_sessions', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auth_sessions_user_id', table_name='auth_sessions')
+    op.drop_table('auth_sessions')
@@ -0,0 +1,27 @@
+"""Flag documents whose AI result is not a real model response
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Set for mock results so duplicate uploads never reuse them
+    op.add_column('documents', sa.Column('ai_degraded', sa.Boolean(), nullable=False, server_default=sa.false()))
+    
+    # Results stored before the flag existed may be mock fallbacks; don't reuse them
+    op.execute("UPDATE documents SET ai_degraded = TRUE WHERE ai_processed_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('documents', 'ai_degraded')
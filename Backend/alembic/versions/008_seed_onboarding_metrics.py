@@ -0,0 +1,65 @@
+"""Seed onboarding metrics rollup rows
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Rollup counter -> (table, extra condition); enums are stored by name
+COUNTERS = {
+    'tasks_total': ('employee_tasks', None),
+    'tasks_completed': ('employee_tasks', "status = 'COMPLETED'"),
+    'tasks_pending': ('employee_tasks', "status = 'PENDING'"),
+    'training_total': ('employee_training', None),
+    'training_completed': ('employee_training', "status = 'COMPLETED'"),
+    'documents_total': ('documents', None),
+    'documents_pending': ('documents', "verification_status = 'PENDING'"),
+    'documents_verified': ('documents', "verification_status = 'VERIFIED'"),
+    'documents_rejected': ('documents', "verification_status = 'REJECTED'"),
+    'documents_failed': ('documents', "verification_status = 'FAILED'"),
+}
+
+
+def _count(table: str, condition, employee_column=None) -> str:
+    """Scalar subquery counting one rollup counter, optionally for one employee"""
+    conditions = [condition] if condition else []
+    if employee_column:
+        conditions.append(f"employee_id = {employee_column}")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"(SELECT COUNT(*) FROM {table}{where})"
+
+
+def upgrade() -> None:
+    # Rows used to be created lazily on first write, which raced when two
+    # transactions created the same row. Seed one per user plus the global row
+    # from the base tables; new users get theirs when they are registered.
+    columns = ', '.join(['scope', *COUNTERS, 'updated_at'])
+    
+    employee_counts = ', '.join(
+        _count(table, condition, 'users.id') for table, condition in COUNTERS.values()
+    )
+    op.execute(
+        f"INSERT INTO onboarding_metrics ({columns}) "
+        f"SELECT users.id, {employee_counts}, CURRENT_TIMESTAMP FROM users "
+        f"WHERE NOT EXISTS (SELECT 1 FROM onboarding_metrics WHERE scope = users.id)"
+    )
+    
+    global_counts = ', '.join(_count(table, condition) for table, condition in COUNTERS.values())
+    op.execute(
+        f"INSERT INTO onboarding_metrics ({columns}) "
+        f"SELECT 'global', {global_counts}, CURRENT_TIMESTAMP "
+        f"WHERE NOT EXISTS (SELECT 1 FROM onboarding_metrics WHERE scope = 'global')"
+    )
+
+
+def downgrade() -> None:
+    # Seeded rows are indistinguishable from maintained ones and stay valid
+    pass
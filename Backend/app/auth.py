@@ -3,6 +3,8 @@ Async authentication utilities for HR Onboarding System
 """
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
@@ -12,6 +14,7 @@ from sqlmodel import select
 from .database import get_async_session
 from .models import UserModel
 from .core.enums import UserRole
+from .core.context_cache import TTLCache
 import os
 from dotenv import load_dotenv
 
@@ -22,12 +25,60 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Seconds a resolved user is reused across requests without a users-table lookup.
+# The cache is per process: a change made through another worker is seen here
+# only once the entry expires, so keep this short.
+PRINCIPAL_CACHE_TTL = float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", "30"))
+
+# Resolve role checks from the role/active claims signed into access tokens.
+# Single-worker deployments only: users changed since their token was issued
+# are tracked in memory (changed_principals), so with several app processes a
+# role change or deactivation made through one worker is not seen by the
+# others, which keep trusting the old claims until the token expires.
+TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Threads running bcrypt off the event loop; bcrypt releases the GIL, so this
+# also caps how many hashes run at once (defaults to CPU count, at most 4)
+PASSWORD_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "0")) or min(os.cpu_count() or 1, 4)
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
 # JWT Bearer token
 security = HTTPBearer()
 
+# Authenticated users keyed by ID, stored without the password hash
+principal_cache = TTLCache(
+    ttl=PRINCIPAL_CACHE_TTL,
+    max_entries=int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+)
+
+# Users changed since their tokens were issued; their claims are not trusted
+# until every token signed before the change has expired. Per process only.
+changed_principals = TTLCache(
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    max_entries=int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+)
+
+
+class Principal:
+    """Authenticated caller identity used for role checks"""
+    
+    def __init__(self, id: str, role: UserRole, is_active: bool = True):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Forget a cached user and stop trusting their token claims after a change"""
+    principal_cache.invalidate(user_id)
+    changed_principals.set(user_id, True)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -39,6 +90,18 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hashing pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -71,25 +134,33 @@ async def authenticate_user(session: AsyncSession, email: str, password: str) ->
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(password, user.password_hash):
+    if not user or not await verify_password_async(password, user.password_hash):
         return None
     return user
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: AsyncSession = Depends(get_async_session)
-) -> UserModel:
-    """Get current authenticated user"""
-    token = credentials.credentials
-    payload = verify_token(token)
-    
+def _get_token_subject(payload: dict) -> str:
+    """User ID from a verified token payload"""
     user_id: str = payload.get("sub")
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
+    return user_id
+
+
+async def load_active_user(session: AsyncSession, user_id: str) -> UserModel:
+    """
+    Get an active user, from the principal cache when possible
+    A cache hit makes no database query and returns a transient UserModel built
+    from the cached fields (without password_hash). Treat the result as
+    read-only: it is not attached to the session, so never modify, add or
+    delete it - load the user with session.get() to make changes.
+    """
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return UserModel(**cached)
     
     statement = select(UserModel).where(UserModel.id == user_id, UserModel.is_active == True)
     result = await session.execute(statement)
@@ -101,9 +172,48 @@ async def get_current_user(
             detail="User not found"
         )
     
+    principal_cache.set(user_id, user.model_dump(exclude={"password_hash"}))
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> UserModel:
+    """Get current authenticated user"""
+    payload = verify_token(credentials.credentials)
+    user_id = _get_token_subject(payload)
+    return await load_active_user(session, user_id)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> Principal:
+    """
+    Get the caller's ID and role for access checks
+    With AUTH_TRUST_TOKEN_CLAIMS enabled, the signed role/active claims are used
+    directly, except for users changed (in this process) since their token was
+    issued; see TRUST_TOKEN_CLAIMS for why that is single-worker only.
+    """
+    payload = verify_token(credentials.credentials)
+    user_id = _get_token_subject(payload)
+    
+    if TRUST_TOKEN_CLAIMS and "role" in payload and changed_principals.get(user_id) is None:
+        if payload.get("active") is not True:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        try:
+            return Principal(id=user_id, role=UserRole(payload["role"]))
+        except ValueError:
+            pass
+    
+    user = await load_active_user(session, user_id)
+    return Principal(id=user.id, role=user.role, is_active=user.is_active)
+
+
 def require_role(required_role: UserRole):
     """Dependency to require specific user role"""
     async def role_checker(current_user: UserModel = Depends(get_current_user)) -> UserModel:
@@ -2,14 +2,64 @@
 AI Configuration and Initialization
 """
 import os
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 import google.generativeai as genai
 
+from .llm_cache import LLMCache, MemoryLLMCache, SQLiteLLMCache
+
 class AIConfig:
     """Centralized AI configuration"""
     
     _gemini_model: Optional[genai.GenerativeModel] = None
     _mock_mode: bool = None
+    _gemini_semaphore: Optional[asyncio.Semaphore] = None
+    
+    # Maximum number of Gemini requests in flight per worker
+    max_concurrency: int = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+    
+    # Per-call timeout for Gemini requests, in seconds
+    request_timeout: float = float(os.getenv("AI_REQUEST_TIMEOUT", "30"))
+    
+    # Worker processes for OCR/PDF text extraction (defaults to CPU count)
+    extraction_workers: int = int(os.getenv("AI_EXTRACTION_WORKERS", "0")) or (os.cpu_count() or 1)
+    
+    # Maximum extraction jobs queued or running before uploads are refused
+    extraction_max_queue: int = int(os.getenv("AI_EXTRACTION_MAX_QUEUE", "0")) or extraction_workers * 4
+    
+    # Background document pipeline workers per app process. Each handles one document
+    # at a time (extract -> validate -> persist), so this caps how many extractions
+    # run at once; defaults to extraction_workers so every extraction process is used
+    processing_workers: int = int(os.getenv("AI_PROCESSING_WORKERS", "0")) or extraction_workers
+    
+    # Attempts before a document is marked as failed
+    processing_max_attempts: int = int(os.getenv("AI_PROCESSING_MAX_ATTEMPTS", "3"))
+    
+    # Base retry delay in seconds, doubled after each failed attempt
+    processing_retry_delay: float = float(os.getenv("AI_PROCESSING_RETRY_DELAY", "5"))
+    
+    # Seconds after which a document stuck in processing is treated as abandoned
+    processing_stale_after: float = float(os.getenv("AI_PROCESSING_STALE_AFTER", "300"))
+    
+    # Local intent confidence below which the HR assistant asks the LLM to classify
+    intent_confidence_threshold: float = float(os.getenv("AI_INTENT_CONFIDENCE", "0.6"))
+    
+    # Ask the LLM to phrase onboarding summaries; scores are always computed locally
+    onboarding_narrative: bool = os.getenv("AI_ONBOARDING_NARRATIVE", "true").lower() == "true"
+    
+    # LLM response cache: "memory", "sqlite" (shared across workers) or "none"
+    cache_backend: str = os.getenv("AI_CACHE_BACKEND", "memory").lower()
+    cache_ttl: float = float(os.getenv("AI_CACHE_TTL", "3600"))
+    cache_max_entries: int = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1000"))
+    cache_max_bytes: int = int(os.getenv("AI_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    cache_path: str = os.getenv("AI_CACHE_PATH", "llm_cache.sqlite3")
+    
+    _llm_cache: Optional[LLMCache] = None
+    _extraction_executor: Optional[ProcessPoolExecutor] = None
+    _extraction_lock = threading.Lock()
+    _extraction_jobs: int = 0
     
     @classmethod
     def is_mock_mode(cls) -> bool:
@@ -24,7 +74,7 @@ class AIConfig:
         # In mock mode, don't initialize model
         if cls.is_mock_mode():
             return None
-            
+        
         if cls._gemini_model is None:
             api_key = os.getenv("GEMINI_API_KEY")
             if not api_key:
@@ -35,6 +85,82 @@ class AIConfig:
             cls._gemini_model = genai.GenerativeModel('gemini-1.5-flash-latest')
         
         return cls._gemini_model
+    
+    @classmethod
+    def get_gemini_semaphore(cls) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent Gemini requests"""
+        if cls._gemini_semaphore is None:
+            cls._gemini_semaphore = asyncio.Semaphore(cls.max_concurrency)
+        return cls._gemini_semaphore
+    
+    @classmethod
+    def get_llm_cache(cls) -> LLMCache:
+        """Get the LLM response cache shared by all AI services"""
+        if cls._llm_cache is None:
+            if cls.cache_backend == "sqlite":
+                cls._llm_cache = SQLiteLLMCache(
+                    ttl=cls.cache_ttl,
+                    max_entries=cls.cache_max_entries,
+                    path=cls.cache_path
+                )
+            elif cls.cache_backend == "none":
+                cls._llm_cache = LLMCache(ttl=cls.cache_ttl)
+            else:
+                cls._llm_cache = MemoryLLMCache(
+                    ttl=cls.cache_ttl,
+                    max_entries=cls.cache_max_entries,
+                    max_bytes=cls.cache_max_bytes
+                )
+        return cls._llm_cache
+    
+    @classmethod
+    def get_extraction_executor(cls) -> ProcessPoolExecutor:
+        """Get or start the process pool used for text extraction"""
+        with cls._extraction_lock:
+            if cls._extraction_executor is None:
+                cls._extraction_executor = ProcessPoolExecutor(max_workers=cls.extraction_workers)
+            return cls._extraction_executor
+    
+    @classmethod
+    def reset_extraction_executor(cls, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """
+        Replace an extraction pool that raised BrokenProcessPool (e.g. a worker was killed)
+        Only the first caller to report a broken pool recreates it; later callers
+        holding the same pool get the replacement.
+        """
+        with cls._extraction_lock:
+            if cls._extraction_executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                cls._extraction_executor = None
+            if cls._extraction_executor is None:
+                cls._extraction_executor = ProcessPoolExecutor(max_workers=cls.extraction_workers)
+            return cls._extraction_executor
+    
+    @classmethod
+    def is_extraction_queue_full(cls) -> bool:
+        """Check whether the extraction pool has reached its queue-depth limit"""
+        return cls._extraction_jobs >= cls.extraction_max_queue
+    
+    @classmethod
+    def acquire_extraction_slot(cls) -> bool:
+        """Reserve a place in the extraction queue; returns False when it is full"""
+        if cls.is_extraction_queue_full():
+            return False
+        cls._extraction_jobs += 1
+        return True
+    
+    @classmethod
+    def release_extraction_slot(cls) -> None:
+        """Release a place reserved with acquire_extraction_slot"""
+        cls._extraction_jobs = max(cls._extraction_jobs - 1, 0)
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop background workers owned by the AI layer"""
+        with cls._extraction_lock:
+            if cls._extraction_executor is not None:
+                cls._extraction_executor.shutdown(wait=False, cancel_futures=True)
+                cls._extraction_executor = None
 
 # Singleton instance
 ai_config = AIConfig()
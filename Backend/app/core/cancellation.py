@@ -0,0 +1,37 @@
+"""
+Request cancellation utilities
+"""
+import asyncio
+from typing import Awaitable, TypeVar
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+# Non-standard status used when the client went away before the response was ready
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    awaitable: Awaitable[T],
+    poll_interval: float = 0.5
+) -> T:
+    """
+    Await a long-running operation, cancelling it if the client disconnects
+    Used around AI calls so abandoned requests stop holding Gemini capacity
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST,
+                    detail="Client closed request"
+                )
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,64 @@
+"""
+Context cache - Short-lived per-employee caches for AI prompt context
+"""
+from typing import Any, Dict, Hashable, Optional
+from collections import OrderedDict
+import copy
+import os
+import time
+
+
+class TTLCache:
+    """
+    In-process LRU cache with per-entry TTL
+    Values are deep-copied on the way in and out so callers can't alter cached state.
+    Entries are also dropped explicitly by the services that change the underlying data.
+    """
+    
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if self.ttl <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one entry"""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache size for monitoring"""
+        return {"entries": len(self._entries), "ttl_seconds": self.ttl}
+
+
+# Employee chat context, keyed by employee ID
+employee_context_cache = TTLCache(
+    ttl=float(os.getenv("AI_CONTEXT_CACHE_TTL", "30")),
+    max_entries=int(os.getenv("AI_CONTEXT_CACHE_MAX_ENTRIES", "1000"))
+)
@@ -0,0 +1,76 @@
+"""
+Conversation store - Server-side memory for employee chat sessions
+
+Conversations live in the worker process that served them and are lost on restart.
+With several workers, a message routed to a different worker finds no history
+and silently starts a new conversation, so run the API as a single worker or
+with sticky routing per employee. Persisting conversations to the database is
+the alternative if neither is possible.
+"""
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import os
+import time
+import uuid
+
+
+class Conversation:
+    """Recent chat turns plus a rolling summary of everything older"""
+    
+    def __init__(self):
+        self.summary: str = ""
+        self.turns: List[Dict[str, str]] = []
+        self.summarising: bool = False
+        self.last_active: float = time.monotonic()
+
+
+class ConversationStore:
+    """
+    In-process conversation memory, keyed by employee and conversation ID
+    Per worker: not shared with other processes and not kept across restarts.
+    Keying by employee means one employee can never read another's conversation.
+    Capped by conversation count (least recently active evicted first) and idle time.
+    """
+    
+    def __init__(self, max_conversations: int, idle_ttl: float):
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self._conversations: "OrderedDict[Tuple[str, str], Conversation]" = OrderedDict()
+    
+    def get_or_create(
+        self,
+        employee_id: str,
+        conversation_id: Optional[str] = None
+    ) -> Tuple[str, Conversation]:
+        """Get a conversation, starting a new one when the ID is missing, unknown or expired"""
+        conversation_id = conversation_id or str(uuid.uuid4())
+        key = (employee_id, conversation_id)
+        now = time.monotonic()
+        
+        conversation = self._conversations.get(key)
+        if conversation is None or now - conversation.last_active > self.idle_ttl:
+            conversation = Conversation()
+            self._conversations[key] = conversation
+        
+        conversation.last_active = now
+        self._conversations.move_to_end(key)
+        self._evict(now)
+        return conversation_id, conversation
+    
+    def _evict(self, now: float) -> None:
+        """Drop idle conversations, then the least recently active beyond the cap"""
+        while self._conversations:
+            oldest = next(iter(self._conversations.values()))
+            if (
+                len(self._conversations) <= self.max_conversations
+                and now - oldest.last_active <= self.idle_ttl
+            ):
+                break
+            self._conversations.popitem(last=False)
+
+
+# Employee chatbot conversations; per process, see the module docstring
+conversation_store = ConversationStore(
+    max_conversations=int(os.getenv("AI_CHAT_MAX_CONVERSATIONS", "1000")),
+    idle_ttl=float(os.getenv("AI_CHAT_IDLE_TTL", "3600"))
+)
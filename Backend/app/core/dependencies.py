@@ -5,23 +5,28 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_async_session
+from ..database import get_async_session, get_read_session
 from ..models.user import UserModel
-from ..auth import get_current_user
+from ..auth import get_current_user, get_current_principal, Principal
 from ..core.enums import UserRole
 
 
 # Type aliases for cleaner dependency injection
 SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+# Read replica when available; only for read-only endpoints that tolerate replica lag
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUserDep = Annotated[UserModel, Depends(get_current_user)]
+CurrentPrincipalDep = Annotated[Principal, Depends(get_current_principal)]
 
 
 def require_role(*roles: UserRole):
     """
     Dependency factory to require specific roles
     Usage: dependencies=[Depends(require_role(UserRole.HR))]
+    Resolved from the principal cache or token claims where possible, so the
+    check usually needs no database access.
     """
-    async def role_checker(current_user: CurrentUserDep) -> UserModel:
+    async def role_checker(current_user: CurrentPrincipalDep) -> Principal:
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
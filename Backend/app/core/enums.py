@@ -42,6 +42,14 @@ class VerificationStatus(str, Enum):
     FAILED = "failed"
 
 
+class ProcessingStatus(str, Enum):
+    """Document AI processing status enumeration"""
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class OnboardingStatus(str, Enum):
     """Employee onboarding status enumeration"""
     NOT_STARTED = "NOT_STARTED"
@@ -0,0 +1,218 @@
+"""
+LLM response cache - Shared, bounded cache for Gemini results
+"""
+from typing import Any, Dict, Iterator, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+
+
+def make_cache_key(
+    prompt: str,
+    system_instruction: str,
+    temperature: float,
+    json_mode: bool,
+    model: str = ""
+) -> str:
+    """Cache key covering every input that changes the model output"""
+    content = json.dumps(
+        [model, system_instruction, prompt, temperature, json_mode],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Base class for LLM response caches
+    Values are stored as JSON, so every hit returns a fresh copy that callers may mutate.
+    """
+    
+    backend = "none"
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None on a miss"""
+        return self._record(None)
+    
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result"""
+    
+    def _record(self, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Count a lookup as a hit or a miss"""
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "ttl_seconds": self.ttl
+        }
+
+
+class MemoryLLMCache(LLMCache):
+    """In-process LRU cache with TTL expiry, capped by entry count and total bytes"""
+    
+    backend = "memory"
+    
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._record(None)
+        
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return self._record(None)
+        
+        self._entries.move_to_end(key)
+        return self._record(json.loads(payload))
+    
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value)
+        if len(payload) > self.max_bytes:
+            return
+        
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._bytes += len(payload)
+        
+        # Evict least recently used entries until both caps hold
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+    
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its bytes"""
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        }
+
+
+class SQLiteLLMCache(LLMCache):
+    """
+    On-disk cache in a SQLite file
+    Survives restarts and is shared by every uvicorn worker pointing at the same
+    path. Queries run in a thread so the event loop is never blocked.
+    """
+    
+    backend = "sqlite"
+    
+    def __init__(self, ttl: float, max_entries: int, path: str):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.path = path
+        self._writes = 0
+        
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)"
+            )
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection; one per call keeps the cache safe across threads"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache read failed: {e}")
+            payload = None
+        return self._record(json.loads(payload) if payload is not None else None)
+    
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            await asyncio.to_thread(self._set, key, json.dumps(value))
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache write failed: {e}")
+    
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+    
+    def _set(self, key: str, payload: str) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now + self.ttl, now)
+            )
+            
+            # Prune periodically rather than on every write
+            self._writes += 1
+            if self._writes % 50 == 0:
+                self._prune(conn, now)
+    
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired rows, then the least recently used rows over max_entries"""
+        expired = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        overflow = conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        self.evictions += expired + overflow
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "path": self.path,
+            "max_entries": self.max_entries
+        }
@@ -0,0 +1,222 @@
+"""
+Session store - Refresh token sessions, with an in-memory LRU in front of the database
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import hmac
+import os
+import secrets
+
+from sqlalchemy import update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from ..models.auth_session import AuthSessionModel
+from .context_cache import TTLCache
+
+
+class SessionStore:
+    """
+    Issues, rotates and revokes refresh tokens
+    A refresh token is "<session id>.<secret>"; only the secret's hash is stored.
+    Every refresh replaces the secret with a conditional update, so a token can
+    be used once, and replaying a rotated-out token revokes the whole session.
+    The LRU only saves the session lookup - every rotation and revocation is
+    still checked against the database, so other app processes stay consistent.
+    """
+    
+    def __init__(self, refresh_ttl: float, cache_ttl: float, max_entries: int):
+        self.refresh_ttl = refresh_ttl
+        self._cache = TTLCache(ttl=cache_ttl, max_entries=max_entries)
+    
+    async def create(self, session: AsyncSession, user_id: str) -> str:
+        """Start a session for a user and return its first refresh token"""
+        now = datetime.utcnow()
+        
+        # Keep the table compact: drop the user's finished sessions on each login
+        await session.execute(
+            delete(AuthSessionModel).where(
+                AuthSessionModel.user_id == user_id,
+                (AuthSessionModel.expires_at <= now) | AuthSessionModel.revoked_at.is_not(None)
+            ).execution_options(synchronize_session=False)
+        )
+        
+        secret = secrets.token_urlsafe(32)
+        auth_session = AuthSessionModel(
+            user_id=user_id,
+            token_hash=self._hash(secret),
+            expires_at=now + timedelta(seconds=self.refresh_ttl)
+        )
+        session.add(auth_session)
+        await session.commit()
+        
+        self._cache.set(auth_session.id, self._entry(auth_session))
+        return f"{auth_session.id}.{secret}"
+    
+    async def rotate(self, session: AsyncSession, token: str) -> Optional[Tuple[str, str]]:
+        """
+        Exchange a refresh token for a new one
+        Returns (user_id, new refresh token), or None when the token is invalid,
+        expired, revoked or was already used.
+        """
+        parsed = self._split(token)
+        if parsed is None:
+            return None
+        session_id, secret = parsed
+        token_hash = self._hash(secret)
+        
+        entry = await self._load(session, session_id)
+        if entry is not None and not hmac.compare_digest(entry["token_hash"], token_hash):
+            # The cached hash may be outdated by another process; confirm before acting
+            entry = await self._load(session, session_id, use_cache=False)
+            if entry is not None and self._is_usable(entry) and not hmac.compare_digest(entry["token_hash"], token_hash):
+                # A rotated-out token was replayed; treat it as leaked and end the session
+                await self._revoke_ids(session, [session_id])
+                await session.commit()
+                return None
+        
+        if entry is None or not self._is_usable(entry):
+            return None
+        
+        now = datetime.utcnow()
+        new_secret = secrets.token_urlsafe(32)
+        new_hash = self._hash(new_secret)
+        rotate_result = await session.execute(
+            update(AuthSessionModel).where(
+                AuthSessionModel.id == session_id,
+                AuthSessionModel.token_hash == token_hash,
+                AuthSessionModel.revoked_at.is_(None),
+                AuthSessionModel.expires_at > now
+            ).values(
+                token_hash=new_hash,
+                last_used_at=now
+            ).execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        
+        if rotate_result.rowcount == 0:
+            # Rotated or revoked concurrently
+            self._cache.invalidate(session_id)
+            return None
+        
+        entry["token_hash"] = new_hash
+        self._cache.set(session_id, entry)
+        return entry["user_id"], f"{session_id}.{new_secret}"
+    
+    async def revoke(self, session: AsyncSession, token: str, user_id: Optional[str] = None) -> bool:
+        """Revoke the session behind a refresh token, optionally only if it belongs to user_id"""
+        parsed = self._split(token)
+        if parsed is None:
+            return False
+        session_id, secret = parsed
+        
+        entry = await self._load(session, session_id, use_cache=False)
+        if entry is None or not hmac.compare_digest(entry["token_hash"], self._hash(secret)):
+            return False
+        if user_id is not None and entry["user_id"] != user_id:
+            return False
+        
+        await self._revoke_ids(session, [session_id])
+        await session.commit()
+        return True
+    
+    async def revoke_user(self, session: AsyncSession, user_id: str) -> int:
+        """
+        Revoke every active session of a user
+        Does not commit, so it can join the caller's transaction.
+        """
+        ids_result = await session.execute(
+            select(AuthSessionModel.id).where(
+                AuthSessionModel.user_id == user_id,
+                AuthSessionModel.revoked_at.is_(None)
+            )
+        )
+        session_ids = ids_result.scalars().all()
+        await self._revoke_ids(session, session_ids)
+        return len(session_ids)
+    
+    async def remove_user(self, session: AsyncSession, user_id: str) -> None:
+        """Delete all of a user's sessions; does not commit"""
+        ids_result = await session.execute(
+            select(AuthSessionModel.id).where(AuthSessionModel.user_id == user_id)
+        )
+        for session_id in ids_result.scalars().all():
+            self._cache.invalidate(session_id)
+        
+        await session.execute(
+            delete(AuthSessionModel).where(
+                AuthSessionModel.user_id == user_id
+            ).execution_options(synchronize_session=False)
+        )
+    
+    async def _revoke_ids(self, session: AsyncSession, session_ids: List[str]) -> None:
+        """Mark sessions revoked and drop them from the cache"""
+        if not session_ids:
+            return
+        
+        await session.execute(
+            update(AuthSessionModel).where(
+                AuthSessionModel.id.in_(session_ids),
+                AuthSessionModel.revoked_at.is_(None)
+            ).values(revoked_at=datetime.utcnow()).execution_options(synchronize_session=False)
+        )
+        for session_id in session_ids:
+            self._cache.invalidate(session_id)
+    
+    async def _load(
+        self,
+        session: AsyncSession,
+        session_id: str,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Get a session as a plain dict, from the cache when possible"""
+        if use_cache:
+            entry = self._cache.get(session_id)
+            if entry is not None:
+                return entry
+        
+        auth_session = await session.get(AuthSessionModel, session_id, populate_existing=True)
+        if auth_session is None:
+            self._cache.invalidate(session_id)
+            return None
+        
+        entry = self._entry(auth_session)
+        self._cache.set(session_id, entry)
+        return entry
+    
+    @staticmethod
+    def _entry(auth_session: AuthSessionModel) -> Dict[str, Any]:
+        """Fields needed to validate a refresh token"""
+        return {
+            "user_id": auth_session.user_id,
+            "token_hash": auth_session.token_hash,
+            "expires_at": auth_session.expires_at,
+            "revoked": auth_session.revoked_at is not None
+        }
+    
+    @staticmethod
+    def _is_usable(entry: Dict[str, Any]) -> bool:
+        """Not revoked and not expired"""
+        return not entry["revoked"] and entry["expires_at"] > datetime.utcnow()
+    
+    @staticmethod
+    def _split(token: str) -> Optional[Tuple[str, str]]:
+        """Split a refresh token into session ID and secret"""
+        session_id, _, secret = token.partition(".")
+        if not session_id or not secret:
+            return None
+        return session_id, secret
+    
+    @staticmethod
+    def _hash(secret: str) -> str:
+        """SHA-256 of a refresh token secret"""
+        return hashlib.sha256(secret.encode()).hexdigest()
+
+
+# Refresh token sessions
+session_store = SessionStore(
+    refresh_ttl=float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")) * 24 * 60 * 60,
+    cache_ttl=float(os.getenv("AUTH_SESSION_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("AUTH_SESSION_CACHE_MAX_ENTRIES", "10000"))
+)
@@ -4,6 +4,7 @@ Refactored with Service Layer, Dependency Injection, and Router Separation
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import os
 
 from .database import create_db_and_tables
 from .routers import (
@@ -117,6 +118,26 @@ async def on_startup():
             print("="*50 + "\n")
         else:
             print("✓ Default users already exist, skipping creation.")
+    
+    # Start background document processing (also recovers unprocessed uploads)
+    from .services.document_processing_service import document_processor
+    await document_processor.start()
+
+
+# Shutdown event - Release background workers
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Stop the document pipeline, the text extraction process pool and the
+    password hashing threads
+    """
+    from .core.ai_config import ai_config
+    from .services.document_processing_service import document_processor
+    from .auth import password_executor
+    
+    await document_processor.stop()
+    ai_config.shutdown()
+    password_executor.shutdown(wait=False)
 
 
 # Health check endpoint
@@ -141,6 +162,21 @@ async def scalar_health():
     return {"status": "ok"}
 
 
+# Database pool metrics endpoint
+@app.get("/health/db", tags=["Health"])
+async def database_health():
+    """
+    Connection pool usage for this worker process, for sizing the pool
+    against the number of uvicorn workers
+    """
+    from .database import async_engine, replica_engine, replica_monitor, get_pool_metrics
+    
+    health = {"pid": os.getpid(), "primary": get_pool_metrics(async_engine)}
+    if replica_engine is not None:
+        health["replica"] = {**get_pool_metrics(replica_engine), **replica_monitor.stats()}
+    return health
+
+
 # Application entry point
 if __name__ == "__main__":
     import uvicorn
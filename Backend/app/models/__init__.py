@@ -5,6 +5,9 @@ from .user import UserModel
 from .task import TaskModel, EmployeeTaskModel
 from .document import DocumentModel
 from .training import TrainingModuleModel, EmployeeTrainingModel
+from .metrics import OnboardingMetricsModel
+from .onboarding import OnboardingAnalysisModel
+from .auth_session import AuthSessionModel
 
 # Import all models to ensure they are registered with SQLModel
 __all__ = [
@@ -13,5 +16,8 @@ __all__ = [
     "EmployeeTaskModel",
     "DocumentModel",
     "TrainingModuleModel",
-    "EmployeeTrainingModel"
+    "EmployeeTrainingModel",
+    "OnboardingMetricsModel",
+    "OnboardingAnalysisModel",
+    "AuthSessionModel"
 ]
\ No newline at end of file
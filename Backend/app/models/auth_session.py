@@ -0,0 +1,24 @@
+"""
+Authentication session model definitions
+"""
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+import uuid
+
+
+class AuthSessionModel(SQLModel, table=True):
+    """
+    Login session backing a refresh token
+    Only a SHA-256 hash of the current refresh token is stored; it is replaced
+    on every refresh, so a rotated token can no longer be used.
+    """
+    __tablename__ = "auth_sessions"
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    user_id: str = Field(foreign_key="users.id", index=True)
+    token_hash: str = Field(max_length=64)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_used_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+    revoked_at: Optional[datetime] = None
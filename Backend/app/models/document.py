@@ -6,7 +6,7 @@ from typing import Optional
 from datetime import datetime
 import uuid
 
-from ..core.enums import DocumentType, VerificationStatus
+from ..core.enums import DocumentType, VerificationStatus, ProcessingStatus
 
 
 class DocumentModel(SQLModel, table=True):
@@ -20,6 +20,7 @@ class DocumentModel(SQLModel, table=True):
     file_path: str = Field(max_length=500)
     file_size: Optional[int] = None
     mime_type: Optional[str] = Field(max_length=100)
+    content_hash: Optional[str] = Field(default=None, max_length=64, index=True)
     verification_status: VerificationStatus = Field(default=VerificationStatus.PENDING)
     verification_notes: Optional[str] = None
     verified_by: Optional[str] = Field(foreign_key="users.id")
@@ -32,6 +33,15 @@ class DocumentModel(SQLModel, table=True):
     ai_validation_result: Optional[str] = Field(default=None)
     ai_confidence_score: Optional[float] = Field(default=None)
     ai_processed_at: Optional[datetime] = Field(default=None)
+    # True when the result is mock data rather than a real model response
+    ai_degraded: bool = Field(default=False)
+    
+    # Background processing state
+    processing_status: ProcessingStatus = Field(default=ProcessingStatus.QUEUED, index=True)
+    processing_attempts: int = Field(default=0)
+    processing_error: Optional[str] = Field(default=None)
+    processing_started_at: Optional[datetime] = Field(default=None)
+    next_attempt_at: Optional[datetime] = Field(default=None)
     
     # Simplified relationships
     related_task: Optional["TaskModel"] = Relationship(back_populates="documents")
\ No newline at end of file
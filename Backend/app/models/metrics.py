@@ -0,0 +1,37 @@
+"""
+Onboarding metrics rollup model definitions
+"""
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+# Scope key of the organisation-wide rollup row
+GLOBAL_METRICS_SCOPE = "global"
+
+
+class OnboardingMetricsModel(SQLModel, table=True):
+    """
+    Materialised onboarding counters
+    One row per employee (scope = employee id) plus one global row
+    (scope = GLOBAL_METRICS_SCOPE), maintained incrementally by the services
+    """
+    __tablename__ = "onboarding_metrics"
+    
+    scope: str = Field(primary_key=True, max_length=64)
+    
+    # Task assignment counters
+    tasks_total: int = Field(default=0)
+    tasks_completed: int = Field(default=0)
+    tasks_pending: int = Field(default=0)
+    
+    # Training progress counters
+    training_total: int = Field(default=0)
+    training_completed: int = Field(default=0)
+    
+    # Document verification counters
+    documents_total: int = Field(default=0)
+    documents_pending: int = Field(default=0)
+    documents_verified: int = Field(default=0)
+    documents_rejected: int = Field(default=0)
+    documents_failed: int = Field(default=0)
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
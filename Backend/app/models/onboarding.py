@@ -0,0 +1,19 @@
+"""
+Onboarding analysis model definitions
+"""
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class OnboardingAnalysisModel(SQLModel, table=True):
+    """
+    Latest AI onboarding analysis per employee
+    The fingerprint hashes the analysis inputs, so a stored analysis is reused
+    until the employee's tasks, documents, training or profile change.
+    """
+    __tablename__ = "onboarding_analyses"
+    
+    employee_id: str = Field(primary_key=True, foreign_key="users.id")
+    fingerprint: str = Field(max_length=64)
+    analysis: str  # JSON-encoded analysis result
+    analyzed_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,11 +1,15 @@
 """
 AI Assistants Router
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Optional
+import json
 
-from ..core.dependencies import SessionDep, CurrentUserDep
+from ..core.dependencies import SessionDep, ReadSessionDep, CurrentUserDep
+from ..core.cancellation import cancel_on_disconnect
+from ..core.ai_config import ai_config
 from ..services.hr_assistant_service import HRAssistantService
 from ..services.employee_assistant_service import EmployeeAssistantService
 from ..core.enums import UserRole
@@ -19,13 +23,17 @@ class QueryRequest(BaseModel):
 
 class ChatRequest(BaseModel):
     message: str
+    # Returned by the previous reply; the server keeps the conversation memory
+    conversation_id: Optional[str] = Field(None, max_length=64)
+    # Deprecated: only used to seed a new conversation
     history: Optional[List[dict]] = []
 
 # HR Assistant
 @router.post("/hr/ask")
 async def ask_hr_assistant(
     request: QueryRequest,
-    session: SessionDep,
+    http_request: Request,
+    session: ReadSessionDep,
     current_user: CurrentUserDep
 ):
     """HR natural language query assistant"""
@@ -35,8 +43,13 @@ async def ask_hr_assistant(
         raise HTTPException(status_code=403, detail="HR access only")
     
     try:
-        answer = await hr_assistant.answer_query(request.query, session)
+        answer = await cancel_on_disconnect(
+            http_request,
+            hr_assistant.answer_query(request.query, session)
+        )
         return answer
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
 
@@ -44,19 +57,71 @@ async def ask_hr_assistant(
 @router.post("/employee/chat")
 async def employee_chat(
     request: ChatRequest,
+    http_request: Request,
     session: SessionDep,
     current_user: CurrentUserDep
 ):
     """Employee onboarding chatbot"""
     
     try:
-        response = await employee_assistant.chat(
+        response = await cancel_on_disconnect(
+            http_request,
+            employee_assistant.chat(
+                employee_id=current_user.id,
+                message=request.message,
+                session=session,
+                conversation_history=request.history,
+                conversation_id=request.conversation_id
+            )
+        )
+        
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+@router.post("/employee/chat/stream")
+async def employee_chat_stream(
+    request: ChatRequest,
+    session: SessionDep,
+    current_user: CurrentUserDep
+):
+    """Employee onboarding chatbot, streamed as server-sent events"""
+    
+    try:
+        events = await employee_assistant.chat_stream(
             employee_id=current_user.id,
             message=request.message,
             session=session,
-            conversation_history=request.history
+            conversation_history=request.history,
+            conversation_id=request.conversation_id
         )
-        
-        return response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+    
+    async def event_stream():
+        try:
+            async for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Chat failed: {str(e)}'})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# LLM cache monitoring
+@router.get("/cache/stats")
+async def get_llm_cache_stats(current_user: CurrentUserDep):
+    """LLM response cache hit/miss counters"""
+    
+    # Only HR can view this
+    if current_user.role != UserRole.HR:
+        raise HTTPException(status_code=403, detail="HR access only")
+    
+    return ai_config.get_llm_cache().stats()
@@ -2,13 +2,14 @@
 Authentication Router - Login, Register, Token Management
 """
 from fastapi import APIRouter, Depends
-from typing import Annotated
+from typing import Annotated, Optional
 
 from ..core.dependencies import SessionDep, CurrentUserDep, require_role
 from ..services.auth_service import AuthService
 from ..schemas.user import (
     UserLoginSchema, UserLoginResponseSchema,
-    UserCreateSchema, UserResponseSchema
+    UserCreateSchema, UserResponseSchema,
+    RefreshTokenSchema, TokenResponseSchema
 )
 from ..schemas.responses import MessageResponseSchema
 from ..core.enums import UserRole
@@ -19,9 +20,9 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/login", response_model=UserLoginResponseSchema)
 async def login(login_data: UserLoginSchema, session: SessionDep):
     """
-    Authenticate user and return access token
+    Authenticate user and return access and refresh tokens
     """
-    access_token, user = await AuthService.login_user(
+    access_token, refresh_token, user = await AuthService.login_user(
         session,
         login_data.email,
         login_data.password
@@ -29,11 +30,30 @@ async def login(login_data: UserLoginSchema, session: SessionDep):
     
     return UserLoginResponseSchema(
         access_token=access_token,
+        refresh_token=refresh_token,
         token_type="bearer",
         user=UserResponseSchema.from_orm(user)
     )
 
 
+@router.post("/refresh", response_model=TokenResponseSchema)
+async def refresh(refresh_data: RefreshTokenSchema, session: SessionDep):
+    """
+    Exchange a refresh token for a new access token
+    The refresh token is rotated - the one sent can't be used again.
+    """
+    access_token, refresh_token = await AuthService.refresh_tokens(
+        session,
+        refresh_data.refresh_token
+    )
+    
+    return TokenResponseSchema(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer"
+    )
+
+
 @router.post(
     "/register",
     response_model=UserResponseSchema,
@@ -52,10 +72,19 @@ async def register_user(
 
 
 @router.post("/logout", response_model=MessageResponseSchema)
-async def logout(current_user: CurrentUserDep):
+async def logout(
+    session: SessionDep,
+    current_user: CurrentUserDep,
+    logout_data: Optional[RefreshTokenSchema] = None
+):
     """
-    Logout endpoint - client should discard token
+    Logout endpoint - revokes the refresh token if given; client should discard both tokens
     """
+    await AuthService.logout_user(
+        session,
+        current_user.id,
+        logout_data.refresh_token if logout_data else None
+    )
     return {"message": "Logged out successfully"}
 
 
@@ -3,7 +3,7 @@ Dashboard Router - Dashboard metrics for HR and Employees
 """
 from fastapi import APIRouter, Depends
 
-from ..core.dependencies import SessionDep, CurrentUserDep
+from ..core.dependencies import ReadSessionDep, CurrentUserDep
 from ..services.performance_service import PerformanceService
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
 @router.get("/")
 async def get_dashboard(
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUserDep
 ):
     """
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 import json
 
 from ..core.dependencies import SessionDep, CurrentUserDep
+from ..database import AsyncSessionLocal, get_read_sessionmaker
 from ..services.document_service import DocumentService
 from ..schemas.document import DocumentUploadResponseSchema
 from ..models.document import DocumentModel
@@ -22,7 +23,6 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 
 @router.get("/")
 async def get_documents(
-    session: SessionDep,
     current_user: CurrentUserDep,
     page: int = 1,
     page_size: int = 50
@@ -34,12 +34,19 @@ async def get_documents(
     from ..core.enums import UserRole
     employee_id = None if current_user.role == UserRole.HR else current_user.id
     
-    return await document_service.get_all_documents(
-        session,
-        page=page,
-        page_size=page_size,
-        employee_id=employee_id
-    )
+    # HR's organisation-wide listing can lag slightly; employees must see their own uploads
+    if current_user.role == UserRole.HR:
+        session_factory = await get_read_sessionmaker()
+    else:
+        session_factory = AsyncSessionLocal
+    
+    async with session_factory() as session:
+        return await document_service.get_all_documents(
+            session,
+            page=page,
+            page_size=page_size,
+            employee_id=employee_id
+        )
 
 
 @router.post(
@@ -67,7 +74,27 @@ async def upload_document(
     
     return DocumentUploadResponseSchema(
         message="Document uploaded successfully",
-        document_id=document.id
+        document_id=document.id,
+        processing_status=document.processing_status
+    )
+
+
+@router.get("/{document_id}/status")
+async def get_document_processing_status(
+    document_id: str,
+    session: SessionDep,
+    current_user: CurrentUserDep
+):
+    """
+    Poll AI processing status - Employee can see own, HR can see all
+    """
+    document_service = DocumentService(UPLOAD_DIR)
+    employee_id = None if current_user.role == UserRole.HR else current_user.id
+    
+    return await document_service.get_processing_status(
+        session,
+        document_id,
+        employee_id=employee_id
     )
 
 
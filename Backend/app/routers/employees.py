@@ -6,7 +6,7 @@ from sqlmodel import select
 from typing import Dict, Any
 import json
 
-from ..core.dependencies import SessionDep, CurrentUserDep, require_role
+from ..core.dependencies import SessionDep, ReadSessionDep, CurrentUserDep, require_role
 from ..services.employee_service import EmployeeService
 from ..services.ai_document_service import AIDocumentService
 from ..schemas.user import UserResponseSchema, UserUpdateSchema
@@ -28,7 +28,7 @@ router = APIRouter(prefix="/api/employees", tags=["Employees"])
     dependencies=[Depends(require_role(UserRole.HR))]
 )
 async def get_all_employees(
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUserDep,
     page: int = 1,
     page_size: int = 50
@@ -46,7 +46,7 @@ async def get_all_employees(
 )
 async def manage_employee(
     employee_id: str,
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUserDep
 ):
     """
@@ -1,9 +1,10 @@
 """
 Onboarding AI Router
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from ..core.dependencies import SessionDep, CurrentUserDep
+from ..core.cancellation import cancel_on_disconnect
 from ..services.onboarding_ai_service import OnboardingAIService
 from ..core.enums import UserRole
 
@@ -13,6 +14,7 @@ onboarding_service = OnboardingAIService()
 @router.get("/employee/{employee_id}/status")
 async def get_onboarding_status(
     employee_id: str,
+    request: Request,
     session: SessionDep,
     current_user: CurrentUserDep
 ):
@@ -23,20 +25,24 @@ async def get_onboarding_status(
         raise HTTPException(status_code=403, detail="Access denied")
     
     try:
-        analysis = await onboarding_service.analyze_employee_onboarding(
-            employee_id, session
+        analysis = await cancel_on_disconnect(
+            request,
+            onboarding_service.analyze_employee_onboarding(employee_id, session)
         )
         
         return {
             "employee_id": employee_id,
             "analysis": analysis
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @router.post("/employee/{employee_id}/refresh")
 async def refresh_onboarding_status(
     employee_id: str,
+    request: Request,
     session: SessionDep,
     current_user: CurrentUserDep
 ):
@@ -46,13 +52,16 @@ async def refresh_onboarding_status(
         raise HTTPException(status_code=403, detail="Access denied")
     
     try:
-        analysis = await onboarding_service.analyze_employee_onboarding(
-            employee_id, session
+        analysis = await cancel_on_disconnect(
+            request,
+            onboarding_service.analyze_employee_onboarding(employee_id, session, force=True)
         )
         
         return {
             "message": "Onboarding status refreshed",
             "analysis": analysis
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Refresh failed: {str(e)}")
@@ -3,7 +3,7 @@ Performance Router - Performance metrics and analytics
 """
 from fastapi import APIRouter, Depends
 
-from ..core.dependencies import SessionDep, CurrentUserDep, require_role
+from ..core.dependencies import ReadSessionDep, CurrentUserDep, require_role
 from ..services.performance_service import PerformanceService
 from ..schemas.responses import OverallPerformanceSchema, EmployeePerformanceSchema
 from ..core.enums import UserRole
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/performance", tags=["Performance"])
     dependencies=[Depends(require_role(UserRole.HR))]
 )
 async def get_overall_performance(
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUserDep
 ):
     """
@@ -33,7 +33,7 @@ async def get_overall_performance(
 )
 async def get_employee_performance(
     employee_id: str,
-    session: SessionDep,
+    session: ReadSessionDep,
     current_user: CurrentUserDep
 ):
     """
@@ -7,7 +7,9 @@ from .user import (
     UserUpdateSchema,
     UserResponseSchema,
     UserLoginSchema,
-    UserLoginResponseSchema
+    UserLoginResponseSchema,
+    RefreshTokenSchema,
+    TokenResponseSchema
 )
 from .task import (
     TaskBaseSchema,
@@ -63,6 +65,8 @@ __all__ = [
     "UserResponseSchema",
     "UserLoginSchema",
     "UserLoginResponseSchema",
+    "RefreshTokenSchema",
+    "TokenResponseSchema",
     
     # Task schemas
     "TaskBaseSchema",
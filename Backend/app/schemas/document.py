@@ -5,7 +5,7 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
-from ..core.enums import DocumentType, VerificationStatus
+from ..core.enums import DocumentType, VerificationStatus, ProcessingStatus
 
 
 class DocumentBaseSchema(BaseModel):
@@ -47,4 +47,5 @@ class DocumentResponseSchema(DocumentBaseSchema):
 class DocumentUploadResponseSchema(BaseModel):
     """Schema for document upload response"""
     message: str
-    document_id: str
\ No newline at end of file
+    document_id: str
+    processing_status: ProcessingStatus = ProcessingStatus.QUEUED
\ No newline at end of file
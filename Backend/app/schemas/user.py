@@ -33,7 +33,7 @@ class UserResponseSchema(UserBaseSchema):
     id: str
     created_at: datetime
     updated_at: datetime
-
+    
     class Config:
         from_attributes = True
 
@@ -47,5 +47,18 @@ class UserLoginSchema(BaseModel):
 class UserLoginResponseSchema(BaseModel):
     """Schema for login response"""
     access_token: str
+    refresh_token: str
     token_type: str
-    user: UserResponseSchema
\ No newline at end of file
+    user: UserResponseSchema
+
+
+class RefreshTokenSchema(BaseModel):
+    """Schema for refresh and logout requests"""
+    refresh_token: str
+
+
+class TokenResponseSchema(BaseModel):
+    """Schema for token refresh response"""
+    access_token: str
+    refresh_token: str
+    token_type: str
\ No newline at end of file
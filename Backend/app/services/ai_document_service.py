@@ -2,69 +2,91 @@
 AI Document Analysis Service
 """
 from pathlib import Path
-from typing import Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, Optional
 import PyPDF2
 from PIL import Image
 import pytesseract
 from datetime import datetime
+import asyncio
 import json
+from concurrent.futures.process import BrokenProcessPool
 
 from .base_ai_service import BaseAIService
+from ..core.ai_config import ai_config
 from ..models.document import DocumentModel
 from ..core.enums import DocumentType
 from ..utils.masking import DataMasker
 
+class ExtractionQueueFullError(Exception):
+    """Raised when the text extraction pool is at its queue-depth limit"""
+
+
+def extract_text_from_file(file_path: str) -> str:
+    """
+    Extract text from PDF or Image
+    Runs in the extraction process pool, so it must stay a picklable module-level function.
+    Read and OCR errors propagate so the processing pipeline can retry the document.
+    """
+    extension = Path(file_path).suffix.lower()
+    
+    # PDF extraction
+    if extension == '.pdf':
+        return _extract_from_pdf(file_path)
+    
+    # Image extraction (OCR)
+    elif extension in ['.jpg', '.jpeg', '.png', '.bmp', '.gif']:
+        return _extract_from_image_tesseract(file_path)
+    
+    # Text file
+    elif extension in ['.txt', '.text']:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    else:
+        return ""
+
+
+def _extract_from_pdf(file_path: str) -> str:
+    """Extract text from PDF"""
+    text = ""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            text += page.extract_text()
+    return text.strip()
+
+
+def _extract_from_image_tesseract(file_path: str) -> str:
+    """Extract text using Tesseract OCR"""
+    image = Image.open(file_path)
+    text = pytesseract.image_to_string(image)
+    return text.strip()
+
+
 class AIDocumentService(BaseAIService):
     """AI-powered document analysis"""
     
     async def extract_text(self, file_path: str) -> str:
-        """Extract text from PDF or Image"""
-        file_path_obj = Path(file_path)
-        extension = file_path_obj.suffix.lower()
+        """
+        Extract text from PDF or Image
+        CPU-bound OCR/PDF parsing runs in the extraction process pool so the
+        event loop stays free; raises ExtractionQueueFullError when the pool is saturated.
+        If a pool worker died, the pool is recreated and the job retried once.
+        """
+        if not ai_config.acquire_extraction_slot():
+            raise ExtractionQueueFullError("Text extraction queue is full")
         
         try:
-            # PDF extraction
-            if extension == '.pdf':
-                return self._extract_from_pdf(file_path)
-            
-            # Image extraction (OCR)
-            elif extension in ['.jpg', '.jpeg', '.png', '.bmp', '.gif']:
-                return self._extract_from_image_tesseract(file_path)
-            
-            # Text file
-            elif extension in ['.txt', '.text']:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            
-            else:
-                return ""
-                
-        except Exception as e:
-            print(f"Text extraction failed: {str(e)}")
-            return ""
-    
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-        except Exception as e:
-            print(f"PDF extraction failed: {e}")
-        return text.strip()
-    
-    def _extract_from_image_tesseract(self, file_path: str) -> str:
-        """Extract text using Tesseract OCR"""
-        try:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
-            return text.strip()
-        except Exception as e:
-            print(f"OCR failed: {e}")
-            return ""
+            loop = asyncio.get_running_loop()
+            executor = ai_config.get_extraction_executor()
+            try:
+                return await loop.run_in_executor(executor, extract_text_from_file, file_path)
+            except BrokenProcessPool:
+                print("⚠️ Text extraction pool broke, restarting it")
+                executor = ai_config.reset_extraction_executor(executor)
+                return await loop.run_in_executor(executor, extract_text_from_file, file_path)
+        finally:
+            ai_config.release_extraction_slot()
     
     async def validate_document(
         self,
@@ -82,10 +104,12 @@ class AIDocumentService(BaseAIService):
         Be strict but fair. Flag genuine issues only.
         """
         
+        # No mock fallback: a failed call raises so the document is retried
         result = await self.call_gemini(
             prompt=prompt,
             system_instruction=system_instruction,
-            json_mode=True
+            json_mode=True,
+            fallback=False
         )
         
         return result
@@ -244,66 +268,57 @@ class AIDocumentService(BaseAIService):
             }}
             """
     
-    async def process_document(
+    async def analyze_document(
         self,
         document: DocumentModel,
-        session: AsyncSession
+        extracted_text: Optional[str] = None
     ) -> DocumentModel:
-        """Full AI processing pipeline for a document"""
-        
-        try:
-            # Step 1: Extract text
+        """
+        AI analysis stages for a document: extract, validate and mask
+        Populates the AI fields on the document without committing; errors
+        propagate so the processing pipeline can retry. Pass extracted_text
+        to skip extraction when the text is already known.
+        """
+        # Step 1: Extract text
+        if extracted_text is None:
             text = await self.extract_text(document.file_path)
-            document.extracted_text = text[:5000] if text else ""  # Limit storage
-            
-            if not text or len(text) < 10:
-                document.verification_notes = "AI: No readable text found in document"
-                document.ai_confidence_score = 0.0
-                document.ai_processed_at = datetime.utcnow()
-                session.add(document)
-                await session.commit()
-                await session.refresh(document)
-                return document
-            
-            # Step 2: Validate with AI
-            validation = await self.validate_document(text, document.document_type)
-            
-            # Step 3: Apply data masking for sensitive fields
-            masked_validation = DataMasker.mask_document_data(
-                validation, 
-                document.document_type.value
-            )
-            
-            # Store masked version for HR viewing
-            document.ai_validation_result = json.dumps(masked_validation)
-            document.ai_confidence_score = float(validation.get('confidence', 0.0))
-            document.ai_processed_at = datetime.utcnow()
-            
-            # Step 4: Auto-update verification status based on AI result
-            if validation.get('confidence', 0) > 0.8 and not validation.get('issues', []):
-                document.verification_notes = "AI: Ready for HR review (high confidence)"
-            else:
-                issues = validation.get('issues', [])
-                if issues:
-                    document.verification_notes = f"AI: Needs review - {', '.join(issues[:3])}"
-                else:
-                    document.verification_notes = "AI: Processed successfully"
-            
-            # Save to database
-            session.add(document)
-            await session.commit()
-            await session.refresh(document)
-            
-            return document
-            
-        except Exception as e:
-            # If AI fails, don't block upload - just log it
-            print(f"AI processing error: {str(e)}")
-            document.verification_notes = f"AI processing failed: {str(e)[:100]}"
+        else:
+            text = extracted_text
+        document.extracted_text = text[:5000] if text else ""  # Limit storage
+        document.ai_degraded = False
+        
+        if not text or len(text) < 10:
+            document.verification_notes = "AI: No readable text found in document"
+            document.ai_confidence_score = 0.0
             document.ai_processed_at = datetime.utcnow()
-            session.add(document)
-            await session.commit()
             return document
+        
+        # Step 2: Validate with AI
+        validation = await self.validate_document(text, document.document_type)
+        
+        # Step 3: Apply data masking for sensitive fields
+        masked_validation = DataMasker.mask_document_data(
+            validation, 
+            document.document_type.value
+        )
+        
+        # Store masked version for HR viewing; mock results are flagged so they are never reused
+        document.ai_validation_result = json.dumps(masked_validation)
+        document.ai_degraded = ai_config.is_mock_mode()
+        document.ai_confidence_score = float(validation.get('confidence', 0.0))
+        document.ai_processed_at = datetime.utcnow()
+        
+        # Step 4: Auto-update verification status based on AI result
+        if validation.get('confidence', 0) > 0.8 and not validation.get('issues', []):
+            document.verification_notes = "AI: Ready for HR review (high confidence)"
+        else:
+            issues = validation.get('issues', [])
+            if issues:
+                document.verification_notes = f"AI: Needs review - {', '.join(issues[:3])}"
+            else:
+                document.verification_notes = "AI: Processed successfully"
+        
+        return document
     
     def get_masked_document_data(self, document: DocumentModel) -> Dict[str, Any]:
         """Get document data with sensitive fields masked for HR viewing"""
@@ -323,6 +338,6 @@ class AIDocumentService(BaseAIService):
             }
             
             return filtered_data
-            
+        
         except Exception as e:
             return {"error": f"Failed to parse document data: {str(e)}"}
@@ -2,25 +2,26 @@
 Authentication Service - Handles user authentication and registration logic
 """
 from typing import Optional
-from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
 
 from ..models.user import UserModel
 from ..schemas.user import UserCreateSchema
-from ..auth import authenticate_user, create_access_token, get_password_hash
+from ..auth import authenticate_user, create_access_token, get_password_hash_async, load_active_user
+from ..core.session_store import session_store
 from ..core.enums import UserRole
+from .metrics_rollup_service import MetricsRollupService
 
 
 class AuthService:
     """Service for authentication operations"""
     
     @staticmethod
-    async def login_user(session: AsyncSession, email: str, password: str) -> tuple[str, UserModel]:
+    async def login_user(session: AsyncSession, email: str, password: str) -> tuple[str, str, UserModel]:
         """
-        Authenticate user and generate access token
-        Returns: (access_token, user)
+        Authenticate user and generate access and refresh tokens
+        Returns: (access_token, refresh_token, user)
         """
         user = await authenticate_user(session, email, password)
         if not user:
@@ -29,13 +30,42 @@ class AuthService:
                 detail="Incorrect email or password"
             )
         
-        access_token_expires = timedelta(minutes=30)
-        access_token = create_access_token(
-            data={"sub": user.id, "role": user.role.value},
-            expires_delta=access_token_expires
-        )
+        access_token = AuthService._create_user_access_token(user)
+        refresh_token = await session_store.create(session, user.id)
         
-        return access_token, user
+        return access_token, refresh_token, user
+    
+    @staticmethod
+    async def refresh_tokens(session: AsyncSession, refresh_token: str) -> tuple[str, str]:
+        """
+        Exchange a refresh token for a new access token and a rotated refresh token
+        No password check is involved, so this never runs bcrypt.
+        Returns: (access_token, refresh_token)
+        """
+        rotated = await session_store.rotate(session, refresh_token)
+        if rotated is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
+            )
+        
+        user_id, new_refresh_token = rotated
+        user = await load_active_user(session, user_id)
+        
+        return AuthService._create_user_access_token(user), new_refresh_token
+    
+    @staticmethod
+    async def logout_user(session: AsyncSession, user_id: str, refresh_token: Optional[str] = None) -> None:
+        """Revoke the session behind a refresh token, if one is given"""
+        if refresh_token:
+            await session_store.revoke(session, refresh_token, user_id=user_id)
+    
+    @staticmethod
+    def _create_user_access_token(user: UserModel) -> str:
+        """Short-lived access token carrying the user's role and active claims"""
+        return create_access_token(
+            data={"sub": user.id, "role": user.role.value, "active": user.is_active}
+        )
     
     @staticmethod
     async def register_user(
@@ -58,7 +88,7 @@ class AuthService:
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         db_user = UserModel(
             name=user_data.name,
             email=user_data.email,
@@ -68,6 +98,7 @@ class AuthService:
         )
         
         session.add(db_user)
+        MetricsRollupService.add_employee(session, db_user.id)
         await session.commit()
         await session.refresh(db_user)
         
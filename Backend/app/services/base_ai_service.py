@@ -1,80 +1,227 @@
 """
 Base AI Service - Reusable AI utilities
 """
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
+import asyncio
+import copy
 import json
-import hashlib
 from functools import lru_cache
 from ..core.ai_config import ai_config
+from ..core.llm_cache import make_cache_key
+
+# Delay between chunks of a mock stream, to mimic token arrival
+MOCK_STREAM_DELAY = 0.05
 
 class BaseAIService:
     """Base class for AI-powered services"""
     
+    # Upstream requests in flight, keyed by cache key and shared by all services
+    _in_flight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+    
+    # Callers awaiting each in-flight request; the request is cancelled when the last one leaves
+    _waiters: Dict["asyncio.Task[Dict[str, Any]]", int] = {}
+    
     def __init__(self):
         self.gemini = ai_config.get_gemini_model()
-        self._request_cache = {}
+        self.cache = ai_config.get_llm_cache()
     
-    def _get_cache_key(self, prompt: str, temperature: float) -> str:
+    def _get_cache_key(
+        self,
+        prompt: str,
+        system_instruction: str,
+        temperature: float,
+        json_mode: bool
+    ) -> str:
         """Generate cache key for request"""
-        content = f"{prompt}_{temperature}"
-        return hashlib.md5(content.encode()).hexdigest()
+        model_name = getattr(self.gemini, "model_name", "")
+        return make_cache_key(prompt, system_instruction, temperature, json_mode, model_name)
     
     async def call_gemini(
         self,
         prompt: str,
         system_instruction: str = "",
         temperature: float = 0.1,
-        json_mode: bool = True
+        json_mode: bool = True,
+        fallback: bool = True
     ) -> Dict[str, Any]:
-        """Call Gemini API with structured output (or return mock data)"""
+        """
+        Call Gemini API with structured output (or return mock data)
+        When the call fails or times out, mock data is returned instead; pass
+        fallback=False to have the error raised so the caller can retry.
+        """
         
         # MOCK MODE: Return fake data without API call
         if ai_config.is_mock_mode():
             return self._get_mock_response(prompt, json_mode)
         
         # Check cache to avoid duplicate API calls
-        cache_key = self._get_cache_key(prompt, temperature)
-        if cache_key in self._request_cache:
-            return self._request_cache[cache_key]
+        cache_key = self._get_cache_key(prompt, system_instruction, temperature, json_mode)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        try:
-            full_prompt = f"{system_instruction}\n\n{prompt}" if system_instruction else prompt
-            
-            if json_mode:
-                full_prompt += "\n\nRespond with ONLY valid JSON, no markdown formatting."
-            
-            # SAFETY: Limit tokens to prevent exhaustion
-            generation_config = {
-                "temperature": temperature,
-                "max_output_tokens": 512,  # Reduced from 2048
-            }
-            
-            response = self.gemini.generate_content(
-                full_prompt,
-                generation_config=generation_config
+        # Single-flight: identical concurrent prompts share one upstream request
+        request = BaseAIService._in_flight.get(cache_key)
+        if request is None:
+            request = asyncio.create_task(
+                self._request_gemini(prompt, system_instruction, temperature, json_mode, cache_key)
             )
-            
-            if json_mode:
-                # Clean response text
-                text = response.text.strip()
-                # Remove markdown code blocks if present
-                if text.startswith("```"):
-                    text = text.split("```")[1]
-                    if text.startswith("json"):
-                        text = text[4:]
-                    text = text.strip()
-                result = json.loads(text)
-            else:
-                result = {"response": response.text}
-            
-            # Cache the result
-            self._request_cache[cache_key] = result
-            return result
-            
+            BaseAIService._in_flight[cache_key] = request
+            request.add_done_callback(lambda done: self._forget_request(cache_key, done))
+        
+        # Shield so one caller disconnecting doesn't cancel the request for the others;
+        # each caller gets its own copy of the result
+        BaseAIService._waiters[request] = BaseAIService._waiters.get(request, 0) + 1
+        try:
+            result = await asyncio.shield(request)
+        except asyncio.CancelledError:
+            # The last caller gave up (e.g. client disconnected): stop the upstream
+            # request so it releases its Gemini semaphore slot
+            if BaseAIService._waiters[request] == 1 and not request.done():
+                self._forget_request(cache_key, request)
+                request.cancel()
+            raise
+        except asyncio.TimeoutError:
+            if not fallback:
+                raise
+            print(f"⚠️ AI call timed out after {ai_config.request_timeout}s, using mock fallback")
+            return self._get_mock_response(prompt, json_mode)
         except Exception as e:
+            if not fallback:
+                raise
             # SAFETY FALLBACK: If AI fails, return mock response for demo reliability
             print(f"⚠️ AI call failed, using mock fallback: {str(e)}")
             return self._get_mock_response(prompt, json_mode)
+        finally:
+            BaseAIService._waiters[request] -= 1
+            if not BaseAIService._waiters[request]:
+                del BaseAIService._waiters[request]
+        return copy.deepcopy(result)
+    
+    @staticmethod
+    def _forget_request(cache_key: str, request: "asyncio.Task[Dict[str, Any]]") -> None:
+        """Remove a request from the single-flight table, unless a newer one replaced it"""
+        if BaseAIService._in_flight.get(cache_key) is request:
+            del BaseAIService._in_flight[cache_key]
+    
+    async def _request_gemini(
+        self,
+        prompt: str,
+        system_instruction: str,
+        temperature: float,
+        json_mode: bool,
+        cache_key: str
+    ) -> Dict[str, Any]:
+        """Send a prompt to Gemini and cache the parsed result; errors propagate to call_gemini"""
+        full_prompt = f"{system_instruction}\n\n{prompt}" if system_instruction else prompt
+        
+        if json_mode:
+            full_prompt += "\n\nRespond with ONLY valid JSON, no markdown formatting."
+        
+        # SAFETY: Limit tokens to prevent exhaustion
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": 512,  # Reduced from 2048
+        }
+        
+        # Run on the SDK's async client so the event loop is never blocked;
+        # the semaphore bounds in-flight requests and wait_for enforces the timeout
+        async with ai_config.get_gemini_semaphore():
+            response = await asyncio.wait_for(
+                self.gemini.generate_content_async(
+                    full_prompt,
+                    generation_config=generation_config
+                ),
+                timeout=ai_config.request_timeout
+            )
+        
+        if json_mode:
+            # Clean response text
+            text = response.text.strip()
+            # Remove markdown code blocks if present
+            if text.startswith("```"):
+                text = text.split("```")[1]
+                if text.startswith("json"):
+                    text = text[4:]
+                text = text.strip()
+            result = json.loads(text)
+        else:
+            result = {"response": response.text}
+        
+        # Cache the result
+        await self.cache.set(cache_key, result)
+        return result
+    
+    async def stream_gemini(
+        self,
+        prompt: str,
+        system_instruction: str = "",
+        temperature: float = 0.1
+    ) -> AsyncIterator[str]:
+        """
+        Stream a plain-text Gemini completion chunk by chunk (or a mock stream)
+        Completed streams are cached like non-JSON call_gemini results. If the
+        call fails before any text arrives, the mock stream is used instead.
+        """
+        if ai_config.is_mock_mode():
+            async for chunk in self._get_mock_stream(prompt):
+                yield chunk
+            return
+        
+        cache_key = self._get_cache_key(prompt, system_instruction, temperature, False)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            yield cached.get("response", "")
+            return
+        
+        full_prompt = f"{system_instruction}\n\n{prompt}" if system_instruction else prompt
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": 512,
+        }
+        chunks = []
+        
+        try:
+            async with ai_config.get_gemini_semaphore():
+                response = await asyncio.wait_for(
+                    self.gemini.generate_content_async(
+                        full_prompt,
+                        generation_config=generation_config,
+                        stream=True
+                    ),
+                    timeout=ai_config.request_timeout
+                )
+                
+                # The timeout applies to the gap between chunks, not the whole stream
+                response_chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            response_chunks.__anext__(),
+                            timeout=ai_config.request_timeout
+                        )
+                    except StopAsyncIteration:
+                        break
+                    
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                        yield chunk.text
+        
+        except Exception as e:
+            print(f"⚠️ AI stream failed: {str(e) or type(e).__name__}")
+            if not chunks:
+                async for chunk in self._get_mock_stream(prompt):
+                    yield chunk
+            return
+        
+        await self.cache.set(cache_key, {"response": "".join(chunks)})
+    
+    async def _get_mock_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Stream a mock response word by word for testing without API calls"""
+        text = json.dumps(self._get_mock_response(prompt, json_mode=True))
+        for index, word in enumerate(text.split(" ")):
+            await asyncio.sleep(MOCK_STREAM_DELAY)
+            yield f" {word}" if index else word
     
     def _get_mock_response(self, prompt: str, json_mode: bool) -> Dict[str, Any]:
         """Generate mock responses for testing without API calls"""
@@ -0,0 +1,273 @@
+"""
+Document Processing Service - Background AI pipeline for uploaded documents
+"""
+from typing import List, Optional, Set
+from datetime import datetime, timedelta
+import asyncio
+
+from sqlalchemy import update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from ..database import AsyncSessionLocal
+from ..models.document import DocumentModel
+from ..core.ai_config import ai_config
+from ..core.enums import ProcessingStatus
+from .ai_document_service import AIDocumentService, ExtractionQueueFullError
+
+# How often abandoned or overdue documents are swept back into the queue, in seconds
+RECOVERY_INTERVAL_SECONDS = 60
+
+
+class DocumentProcessingService:
+    """
+    Runs AI processing (extract -> validate -> mask -> persist) off the request path
+    Documents are claimed with a conditional update, so several app processes can
+    share the same table without processing a document twice.
+    """
+    
+    def __init__(self):
+        self.ai_service = AIDocumentService()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retry_tasks: Set[asyncio.Task] = set()
+        self._pending: Set[str] = set()
+    
+    async def start(self) -> None:
+        """Start the workers and recover documents left unprocessed by a previous run"""
+        if self._queue is not None:
+            return
+        
+        self._queue = asyncio.Queue(maxsize=ai_config.extraction_max_queue)
+        self._tasks = [
+            asyncio.create_task(self._worker())
+            for _ in range(ai_config.processing_workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._recovery_loop()))
+    
+    async def stop(self) -> None:
+        """Cancel the workers; unfinished documents are recovered on next start"""
+        for task in [*self._tasks, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._retry_tasks, return_exceptions=True)
+        
+        self._tasks = []
+        self._retry_tasks = set()
+        self._pending = set()
+        self._queue = None
+    
+    def is_full(self) -> bool:
+        """Check whether the processing queue has reached its limit"""
+        return self._queue is not None and self._queue.full()
+    
+    def enqueue(self, document_id: str) -> bool:
+        """
+        Queue a document for processing
+        Returns False when the pipeline is not running or the queue is full; the
+        document stays queued in the database and is picked up by recovery.
+        """
+        if self._queue is None:
+            return False
+        if document_id in self._pending:
+            return True
+        
+        try:
+            self._queue.put_nowait(document_id)
+        except asyncio.QueueFull:
+            return False
+        
+        self._pending.add(document_id)
+        return True
+    
+    async def recover(self) -> int:
+        """
+        Re-queue documents that still have no AI result
+        Covers uploads queued before a restart, retries that are due, and
+        documents whose worker died mid-processing. Returns the number queued.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=ai_config.processing_stale_after)
+        
+        async with AsyncSessionLocal() as session:
+            # Processing that outlived the stale window was abandoned by a crashed worker
+            await session.execute(
+                update(DocumentModel).where(
+                    DocumentModel.ai_processed_at.is_(None),
+                    DocumentModel.processing_status == ProcessingStatus.PROCESSING,
+                    DocumentModel.processing_started_at < stale_before
+                ).values(
+                    processing_status=ProcessingStatus.QUEUED,
+                    next_attempt_at=None
+                ).execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            
+            due_stmt = select(DocumentModel.id).where(
+                DocumentModel.ai_processed_at.is_(None),
+                DocumentModel.processing_status == ProcessingStatus.QUEUED,
+                or_(
+                    DocumentModel.next_attempt_at.is_(None),
+                    DocumentModel.next_attempt_at <= now
+                )
+            ).order_by(DocumentModel.uploaded_at)
+            due_result = await session.execute(due_stmt)
+            document_ids = due_result.scalars().all()
+        
+        queued = 0
+        for document_id in document_ids:
+            if document_id in self._pending:
+                continue
+            if not self.enqueue(document_id):
+                break
+            queued += 1
+        
+        return queued
+    
+    async def process(self, document_id: str) -> Optional[DocumentModel]:
+        """
+        Run the AI pipeline for one document and persist the outcome
+        Returns None when the document was already claimed or finished elsewhere.
+        """
+        async with AsyncSessionLocal() as session:
+            claimed = await self._claim(session, document_id)
+            if not claimed:
+                return None
+            
+            document = await session.get(DocumentModel, document_id)
+            
+            try:
+                source = await self._find_processed_duplicate(session, document)
+                if source is not None and source.document_type == document.document_type:
+                    self._reuse_analysis(document, source)
+                else:
+                    # Same bytes under another type still skip OCR
+                    await self.ai_service.analyze_document(
+                        document,
+                        extracted_text=source.extracted_text if source else None
+                    )
+            
+            except ExtractionQueueFullError:
+                # Pool saturated; back off without spending an attempt
+                document.processing_attempts = max(document.processing_attempts - 1, 0)
+                await self._schedule_retry(session, document, "Extraction queue full")
+                return document
+            
+            except Exception as e:
+                print(f"AI processing error for document {document_id}: {str(e)}")
+                if document.processing_attempts < ai_config.processing_max_attempts:
+                    await self._schedule_retry(session, document, str(e))
+                    return document
+                
+                # Out of attempts - record the failure so the document isn't retried again
+                document.verification_notes = f"AI processing failed: {str(e)[:100]}"
+                document.processing_status = ProcessingStatus.FAILED
+                document.processing_error = str(e)[:500]
+                document.ai_processed_at = datetime.utcnow()
+                await session.commit()
+                return document
+            
+            document.processing_status = ProcessingStatus.COMPLETED
+            document.processing_error = None
+            document.next_attempt_at = None
+            await session.commit()
+            return document
+    
+    async def _find_processed_duplicate(
+        self,
+        session: AsyncSession,
+        document: DocumentModel
+    ) -> Optional[DocumentModel]:
+        """
+        Find a completed document with the same content uploaded by the same employee
+        Lookups never cross employees, so masked results are only reused by their owner.
+        Degraded (mock) results are skipped. Prefers a match of the same document type.
+        """
+        if not document.content_hash:
+            return None
+        
+        duplicate_stmt = select(DocumentModel).where(
+            DocumentModel.employee_id == document.employee_id,
+            DocumentModel.content_hash == document.content_hash,
+            DocumentModel.id != document.id,
+            DocumentModel.processing_status == ProcessingStatus.COMPLETED,
+            DocumentModel.ai_degraded.is_(False)
+        ).order_by(
+            (DocumentModel.document_type == document.document_type).desc(),
+            DocumentModel.ai_processed_at.desc()
+        ).limit(1)
+        duplicate_result = await session.execute(duplicate_stmt)
+        return duplicate_result.scalar_one_or_none()
+    
+    @staticmethod
+    def _reuse_analysis(document: DocumentModel, source: DocumentModel) -> None:
+        """Copy AI results from an identical, already processed document"""
+        document.extracted_text = source.extracted_text
+        document.ai_validation_result = source.ai_validation_result
+        document.ai_confidence_score = source.ai_confidence_score
+        document.ai_degraded = source.ai_degraded
+        document.verification_notes = source.verification_notes
+        document.ai_processed_at = datetime.utcnow()
+    
+    async def _claim(self, session: AsyncSession, document_id: str) -> bool:
+        """Move a queued document to processing; False if another worker got there first"""
+        claim_stmt = update(DocumentModel).where(
+            and_(
+                DocumentModel.id == document_id,
+                DocumentModel.processing_status == ProcessingStatus.QUEUED,
+                DocumentModel.ai_processed_at.is_(None)
+            )
+        ).values(
+            processing_status=ProcessingStatus.PROCESSING,
+            processing_started_at=datetime.utcnow(),
+            processing_attempts=DocumentModel.processing_attempts + 1
+        ).execution_options(synchronize_session=False)
+        
+        claim_result = await session.execute(claim_stmt)
+        await session.commit()
+        return claim_result.rowcount > 0
+    
+    async def _schedule_retry(self, session: AsyncSession, document: DocumentModel, error: str) -> None:
+        """Put a document back in the queue after an exponential backoff delay"""
+        delay = ai_config.processing_retry_delay * (2 ** max(document.processing_attempts - 1, 0))
+        
+        document.processing_status = ProcessingStatus.QUEUED
+        document.processing_error = error[:500]
+        document.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        await session.commit()
+        
+        retry_task = asyncio.create_task(self._enqueue_later(document.id, delay))
+        self._retry_tasks.add(retry_task)
+        retry_task.add_done_callback(self._retry_tasks.discard)
+    
+    async def _enqueue_later(self, document_id: str, delay: float) -> None:
+        """Queue a document once its backoff has elapsed"""
+        await asyncio.sleep(delay)
+        self.enqueue(document_id)
+    
+    async def _worker(self) -> None:
+        """Take document IDs off the queue and process them one at a time"""
+        while True:
+            document_id = await self._queue.get()
+            try:
+                await self.process(document_id)
+            except Exception as e:
+                # Database errors etc.; recovery will pick the document up again
+                print(f"Document pipeline error for {document_id}: {e}")
+            finally:
+                self._pending.discard(document_id)
+                self._queue.task_done()
+    
+    async def _recovery_loop(self) -> None:
+        """Periodically sweep unprocessed documents back into the queue"""
+        while True:
+            try:
+                recovered = await self.recover()
+                if recovered:
+                    print(f"Document pipeline: queued {recovered} unprocessed document(s)")
+            except Exception as e:
+                print(f"Document pipeline recovery failed: {e}")
+            await asyncio.sleep(RECOVERY_INTERVAL_SECONDS)
+
+
+# Singleton instance
+document_processor = DocumentProcessingService()
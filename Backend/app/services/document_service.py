@@ -1,16 +1,28 @@
 """
 Document Service - Handles document management business logic
 """
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, func
 from fastapi import UploadFile, HTTPException, status
 import aiofiles
+import aiofiles.os
+import hashlib
+import os
+import uuid
 
 from ..models.document import DocumentModel
 from ..core.enums import DocumentType, VerificationStatus
-from .ai_document_service import AIDocumentService
+from ..core.context_cache import employee_context_cache
+from .document_processing_service import document_processor
+from .metrics_rollup_service import MetricsRollupService
+
+# Maximum accepted upload size in bytes
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+
+# Bytes read from the upload stream per write
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class DocumentService:
@@ -18,7 +30,6 @@ class DocumentService:
     
     def __init__(self, upload_dir: Path):
         self.upload_dir = upload_dir
-        self.ai_service = AIDocumentService()
     
     async def get_all_documents(
         self,
@@ -57,6 +68,7 @@ class DocumentService:
                     "document_type": doc.document_type.value,
                     "original_filename": doc.original_filename,
                     "verification_status": doc.verification_status.value,
+                    "processing_status": doc.processing_status.value,
                     "uploaded_at": doc.uploaded_at,
                     "verified_at": doc.verified_at
                 } for doc in documents
@@ -84,15 +96,25 @@ class DocumentService:
                 detail="Invalid document type"
             )
         
-        # Create file path
-        filename = f"{employee_id}_{doc_type.value}_{file.filename}"
-        file_path = self.upload_dir / filename
+        # Backpressure: refuse new uploads while the processing queue is saturated
+        if document_processor.is_full():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Document processing is busy, please retry shortly",
+                headers={"Retry-After": "30"}
+            )
+        
+        # Reject early when the client declared an oversized body
+        if file.size is not None and file.size > MAX_FILE_SIZE:
+            raise self._file_too_large()
         
-        # Save file asynchronously
+        # Stream file into the employee's content-addressed store
         try:
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+            file_path, file_size, content_hash = await self._save_upload(
+                file, employee_id
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,23 +127,110 @@ class DocumentService:
             document_type=doc_type,
             original_filename=file.filename,
             file_path=str(file_path),
-            file_size=file.size,
+            file_size=file_size,
             mime_type=file.content_type,
+            content_hash=content_hash,
             task_id=task_id
         )
         
         session.add(document)
+        await MetricsRollupService.apply_document_status_change(
+            session, employee_id, None, document.verification_status
+        )
         await session.commit()
         await session.refresh(document)
+        employee_context_cache.invalidate(employee_id)
         
-        # Process with AI asynchronously
-        try:
-            document = await self.ai_service.process_document(document, session)
-        except Exception as e:
-            print(f"AI processing failed for document {document.id}: {e}")
+        # Hand off to the background pipeline; recovery catches it if the queue is full
+        document_processor.enqueue(document.id)
         
         return document
     
+    async def _save_upload(self, file: UploadFile, employee_id: str) -> Tuple[Path, int, str]:
+        """
+        Copy an upload to disk in fixed-size chunks
+        Writes to a temp file in the upload directory and renames it into place,
+        so a failed or oversized upload never leaves a partial file behind.
+        Files are stored per employee under their SHA-256, so re-uploading the
+        same bytes reuses the stored copy.
+        Returns the stored path, the size in bytes and the hex digest.
+        """
+        temp_path = self.upload_dir / f".{uuid.uuid4().hex}.part"
+        hasher = hashlib.sha256()
+        file_size = 0
+        
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > MAX_FILE_SIZE:
+                        raise self._file_too_large()
+                    hasher.update(chunk)
+                    await f.write(chunk)
+            
+            content_hash = hasher.hexdigest()
+            file_path = self._content_path(employee_id, content_hash, file.filename)
+            if await aiofiles.os.path.exists(file_path):
+                # Same bytes already stored for this employee
+                await aiofiles.os.remove(temp_path)
+            else:
+                await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
+                await aiofiles.os.replace(temp_path, file_path)
+        except BaseException:
+            if await aiofiles.os.path.exists(temp_path):
+                await aiofiles.os.remove(temp_path)
+            raise
+        
+        return file_path, file_size, content_hash
+    
+    def _content_path(self, employee_id: str, content_hash: str, filename: str) -> Path:
+        """
+        Location of stored content for an employee
+        The original extension is kept since text extraction picks its method by suffix.
+        """
+        suffix = Path(filename or "").suffix.lower()
+        return self.upload_dir / employee_id / f"{content_hash}{suffix}"
+    
+    @staticmethod
+    def _file_too_large() -> HTTPException:
+        """Error for uploads over MAX_FILE_SIZE"""
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds maximum size of {MAX_FILE_SIZE} bytes"
+        )
+    
+    async def get_processing_status(
+        self,
+        session: AsyncSession,
+        document_id: str,
+        employee_id: str = None
+    ) -> Dict[str, Any]:
+        """Get AI processing state of a document, restricted to the owner when employee_id is given"""
+        document = await session.get(DocumentModel, document_id)
+        
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found"
+            )
+        
+        if employee_id and document.employee_id != employee_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+        
+        return {
+            "document_id": document.id,
+            "processing_status": document.processing_status.value,
+            "attempts": document.processing_attempts,
+            "error": document.processing_error,
+            "next_attempt_at": document.next_attempt_at,
+            "processed_at": document.ai_processed_at,
+            "verification_status": document.verification_status.value,
+            "verification_notes": document.verification_notes
+        }
+    
     async def verify_document(
         self,
         session: AsyncSession,
@@ -137,12 +246,17 @@ class DocumentService:
                 detail="Document not found"
             )
         
+        previous_status = document.verification_status
         document.verification_status = verification_status
-        if verification_status in [VerificationStatus.APPROVED, VerificationStatus.REJECTED]:
+        if verification_status in [VerificationStatus.VERIFIED, VerificationStatus.REJECTED]:
             from datetime import datetime
             document.verified_at = datetime.utcnow()
         
+        await MetricsRollupService.apply_document_status_change(
+            session, document.employee_id, previous_status, verification_status
+        )
         await session.commit()
         await session.refresh(document)
+        employee_context_cache.invalidate(document.employee_id)
         
         return document
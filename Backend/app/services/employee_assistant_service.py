@@ -3,13 +3,34 @@ Employee Chat Assistant
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional, Set, Tuple
+import asyncio
+import json
 
-from .base_ai_service import BaseAIService
+from .base_ai_service import BaseAIService, MOCK_STREAM_DELAY
 from ..models.user import UserModel
 from ..models.task import TaskModel, EmployeeTaskModel
 from ..models.document import DocumentModel
 from ..core.enums import TaskStatus, VerificationStatus
+from ..core.context_cache import employee_context_cache
+from ..core.conversation_store import conversation_store, Conversation
+
+CHAT_SYSTEM_INSTRUCTION = "You are a helpful, friendly onboarding assistant. Be concise and actionable."
+
+# Separates the streamed reply text from the trailing structured fields
+REPLY_END_MARKER = "###DETAILS###"
+
+# Turns kept verbatim in the prompt; older turns are folded into the summary
+RECENT_TURNS = 3
+
+# Turns held before the oldest are summarised
+SUMMARISE_AFTER_TURNS = 6
+
+# Upper bound on the rolling conversation summary
+MAX_SUMMARY_CHARS = 1200
+
+# Background summarisation tasks, referenced so they aren't garbage collected
+_summary_tasks: Set[asyncio.Task] = set()
 
 class EmployeeAssistantService(BaseAIService):
     """AI chatbot for employee assistance"""
@@ -19,15 +40,30 @@ class EmployeeAssistantService(BaseAIService):
         employee_id: str,
         message: str,
         session: AsyncSession,
-        conversation_history: List[Dict] = None
+        conversation_history: List[Dict] = None,
+        conversation_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Process employee chat message"""
+        """
+        Process employee chat message
+        Conversation memory is kept server-side under conversation_id; a new
+        conversation is started when it is missing or unknown. Client-sent
+        history is only used to seed a new conversation.
+        """
+        conversation_id, conversation = self._load_conversation(
+            employee_id, conversation_id, conversation_history
+        )
         
         # Step 1: Get employee context
         context = await self._build_employee_context(employee_id, session)
         
         # Step 2: Generate response with context
-        response = await self._generate_response(message, context, conversation_history)
+        response = await self._generate_response(
+            message, context, conversation.turns[-RECENT_TURNS:], conversation.summary
+        )
+        
+        # Step 3: Remember the exchange
+        self._remember_turn(conversation, message, response.get("reply", ""))
+        response["conversation_id"] = conversation_id
         
         return response
     
@@ -36,7 +72,14 @@ class EmployeeAssistantService(BaseAIService):
         employee_id: str,
         session: AsyncSession
     ) -> Dict[str, Any]:
-        """Build comprehensive employee context"""
+        """
+        Build comprehensive employee context
+        Served from the per-employee context cache while fresh; services that
+        change an employee's tasks, documents or profile invalidate the entry.
+        """
+        cached_context = employee_context_cache.get(employee_id)
+        if cached_context is not None:
+            return cached_context
         
         # Get employee
         emp_result = await session.execute(
@@ -60,7 +103,7 @@ class EmployeeAssistantService(BaseAIService):
         )
         documents = docs_result.scalars().all()
         
-        return {
+        context = {
             "employee": {
                 "name": employee.name,
                 "role": employee.role.value,
@@ -85,21 +128,141 @@ class EmployeeAssistantService(BaseAIService):
                 if not any(d.document_type.value == doc_type for d in documents)
             ]
         }
+        
+        employee_context_cache.set(employee_id, context)
+        return context
     
-    async def _generate_response(
+    async def chat_stream(
+        self,
+        employee_id: str,
+        message: str,
+        session: AsyncSession,
+        conversation_history: List[Dict] = None,
+        conversation_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process employee chat message as a stream of events
+        Context is loaded before this returns, so lookup errors surface before
+        streaming starts. The returned iterator yields "token" events with reply
+        text as it arrives, then a "done" event with the full structured response.
+        """
+        conversation_id, conversation = self._load_conversation(
+            employee_id, conversation_id, conversation_history
+        )
+        
+        # Step 1: Get employee context
+        context = await self._build_employee_context(employee_id, session)
+        
+        # Step 2: Stream response with context
+        return self._stream_with_memory(message, context, conversation_id, conversation)
+    
+    async def _stream_with_memory(
         self,
         message: str,
         context: Dict[str, Any],
-        history: List[Dict] = None
-    ) -> Dict[str, Any]:
-        """Generate AI response with employee context"""
+        conversation_id: str,
+        conversation: Conversation
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a response and remember the exchange once it completes"""
+        events = self._stream_response(
+            message, context, conversation.turns[-RECENT_TURNS:], conversation.summary
+        )
+        async for event in events:
+            if event["event"] == "done":
+                self._remember_turn(conversation, message, event["data"]["reply"])
+                event["data"]["conversation_id"] = conversation_id
+            yield event
+    
+    def _load_conversation(
+        self,
+        employee_id: str,
+        conversation_id: Optional[str],
+        conversation_history: List[Dict] = None
+    ) -> Tuple[str, Conversation]:
+        """Get the employee's conversation, seeding a new one from client history"""
+        conversation_id, conversation = conversation_store.get_or_create(
+            employee_id, conversation_id
+        )
+        
+        if conversation_history and not conversation.turns and not conversation.summary:
+            conversation.turns = [
+                {"user": str(h.get("user", "")), "bot": str(h.get("bot", ""))}
+                for h in conversation_history[-RECENT_TURNS:]
+                if isinstance(h, dict)
+            ]
+        
+        return conversation_id, conversation
+    
+    def _remember_turn(self, conversation: Conversation, message: str, reply: str) -> None:
+        """Record an exchange and fold older turns into the summary in the background"""
+        conversation.turns.append({"user": message, "bot": reply})
+        
+        if len(conversation.turns) >= SUMMARISE_AFTER_TURNS and not conversation.summarising:
+            conversation.summarising = True
+            task = asyncio.create_task(self._summarise_conversation(conversation))
+            _summary_tasks.add(task)
+            task.add_done_callback(_summary_tasks.discard)
+    
+    async def _summarise_conversation(self, conversation: Conversation) -> None:
+        """Replace all but the recent turns with an updated rolling summary"""
+        older_turns = conversation.turns[:-RECENT_TURNS]
+        
+        try:
+            transcript = self._format_turns(older_turns)
+            prompt = f"""
+            Update the summary of an onboarding chat between an employee and an assistant.
+            Keep facts, decisions and open questions; drop greetings and repetition.
+            Stay under {MAX_SUMMARY_CHARS} characters.
+            
+            Current summary:
+            {conversation.summary or "(none)"}
+            
+            New exchanges:
+            {transcript}
+            
+            Return JSON:
+            {{
+                "summary": "updated summary"
+            }}
+            """
+            result = await self.call_gemini(prompt, json_mode=True)
+            summary = result.get("summary")
+            
+            if not isinstance(summary, str) or not summary.strip():
+                # No usable summary from the model; keep a compact transcript instead
+                summary = f"{conversation.summary}\n{transcript}".strip()
+            
+            conversation.summary = summary[-MAX_SUMMARY_CHARS:]
+            # Turns appended meanwhile are after older_turns, so drop from the front
+            del conversation.turns[:len(older_turns)]
+        except Exception as e:
+            print(f"Conversation summary failed: {e}")
+        finally:
+            conversation.summarising = False
+    
+    @staticmethod
+    def _format_turns(turns: List[Dict]) -> str:
+        """Render chat turns as a transcript"""
+        return "".join(
+            f"Employee: {h.get('user', '')}\nAssistant: {h.get('bot', '')}\n" for h in turns
+        )
+    
+    def _build_chat_prompt(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        history: List[Dict] = None,
+        summary: str = ""
+    ) -> str:
+        """Build the chat prompt shared by the JSON and streaming responses"""
         
         history_text = ""
+        if summary:
+            history_text += f"Summary of earlier conversation: {summary}\n"
         if history:
-            for h in history[-3:]:
-                history_text += f"Employee: {h.get('user', '')}\nAssistant: {h.get('bot', '')}\n"
+            history_text += self._format_turns(history[-RECENT_TURNS:])
         
-        prompt = f"""
+        return f"""
         You are an onboarding assistant helping an employee.
         
         Employee Context:
@@ -117,20 +280,119 @@ class EmployeeAssistantService(BaseAIService):
         
         Provide a helpful, friendly response.
         If they need to take action, be specific about next steps.
+        """
+    
+    async def _generate_response(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        history: List[Dict] = None,
+        summary: str = ""
+    ) -> Dict[str, Any]:
+        """Generate AI response with employee context"""
         
+        prompt = self._build_chat_prompt(message, context, history, summary) + """
         Return JSON:
-        {{
+        {
             "reply": "Friendly response text",
             "action_items": ["specific action 1"],
             "helpful_links": ["/tasks"],
             "urgency": "low"
-        }}
+        }
         """
         
         result = await self.call_gemini(
             prompt,
-            system_instruction="You are a helpful, friendly onboarding assistant. Be concise and actionable.",
+            system_instruction=CHAT_SYSTEM_INSTRUCTION,
             json_mode=True
         )
         
         return result
+    
+    async def _stream_response(
+        self,
+        message: str,
+        context: Dict[str, Any],
+        history: List[Dict] = None,
+        summary: str = ""
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream reply text, then parse the structured fields that follow the marker"""
+        
+        prompt = self._build_chat_prompt(message, context, history, summary) + f"""
+        Write the reply as plain text first (no JSON, no markdown).
+        Then on a new line write {REPLY_END_MARKER} followed by JSON:
+        {{
+            "action_items": ["specific action 1"],
+            "helpful_links": ["/tasks"],
+            "urgency": "low"
+        }}
+        """
+        
+        pending = ""
+        reply = ""
+        metadata = ""
+        reply_finished = False
+        
+        async for chunk in self.stream_gemini(prompt, system_instruction=CHAT_SYSTEM_INSTRUCTION):
+            if reply_finished:
+                metadata += chunk
+                continue
+            
+            pending += chunk
+            if REPLY_END_MARKER in pending:
+                text, metadata = pending.split(REPLY_END_MARKER, 1)
+                pending = ""
+                reply_finished = True
+            else:
+                # Hold back anything that could be the start of a split marker
+                safe_length = max(len(pending) - len(REPLY_END_MARKER) + 1, 0)
+                text, pending = pending[:safe_length], pending[safe_length:]
+            
+            if text:
+                reply += text
+                yield {"event": "token", "data": {"text": text}}
+        
+        if pending:
+            reply += pending
+            yield {"event": "token", "data": {"text": pending}}
+        
+        details = self._parse_stream_metadata(metadata)
+        yield {
+            "event": "done",
+            "data": {
+                "reply": reply.strip(),
+                "action_items": details.get("action_items", []),
+                "helpful_links": details.get("helpful_links", []),
+                "urgency": details.get("urgency", "low")
+            }
+        }
+    
+    @staticmethod
+    def _parse_stream_metadata(text: str) -> Dict[str, Any]:
+        """Parse the JSON after the reply marker, tolerating markdown fences"""
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            if text.startswith("json"):
+                text = text[4:]
+        
+        try:
+            details = json.loads(text)
+        except ValueError:
+            return {}
+        return details if isinstance(details, dict) else {}
+    
+    async def _get_mock_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Mock stream in the reply-then-marker format"""
+        # The full chat prompt mentions documents, so ask for the chatbot mock directly
+        mock = self._get_mock_response("chat", json_mode=True)
+        details = {
+            "action_items": mock.get("next_steps", []),
+            "helpful_links": ["/tasks", "/documents"],
+            "urgency": "low"
+        }
+        
+        for index, word in enumerate(mock["reply"].split(" ")):
+            await asyncio.sleep(MOCK_STREAM_DELAY)
+            yield f" {word}" if index else word
+        yield f"\n{REPLY_END_MARKER}\n{json.dumps(details)}"
@@ -11,8 +11,13 @@ from ..models.user import UserModel
 from ..models.task import EmployeeTaskModel
 from ..models.document import DocumentModel
 from ..models.training import EmployeeTrainingModel
+from ..models.onboarding import OnboardingAnalysisModel
 from ..schemas.user import UserUpdateSchema
 from ..core.enums import UserRole, TaskStatus
+from .metrics_rollup_service import MetricsRollupService
+from ..core.context_cache import employee_context_cache
+from ..auth import invalidate_principal
+from ..core.session_store import session_store
 
 
 class EmployeeService:
@@ -40,10 +45,15 @@ class EmployeeService:
         employees_result = await session.execute(employees_stmt)
         employees = employees_result.scalars().all()
         
+        # Fetch task statistics for the whole page in one grouped query
+        stats_by_employee = await EmployeeService._get_task_stats_for_employees(
+            session, [employee.id for employee in employees]
+        )
+        
         # Build employee data with statistics
         employee_data = []
         for employee in employees:
-            stats = await EmployeeService._get_employee_task_stats(session, employee.id)
+            stats = stats_by_employee.get(employee.id, EmployeeService._build_task_stats(0, 0))
             employee_data.append({
                 "id": employee.id,
                 "name": employee.name,
@@ -59,18 +69,45 @@ class EmployeeService:
             "page_size": page_size
         }
     
+    @staticmethod
+    async def _get_task_stats_for_employees(
+        session: AsyncSession,
+        employee_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get task statistics for several employees with a single aggregate query
+        Returns a mapping of employee_id -> stats; employees without tasks are omitted
+        """
+        if not employee_ids:
+            return {}
+        
+        stats_stmt = select(
+            EmployeeTaskModel.employee_id,
+            func.count(EmployeeTaskModel.id).label("total"),
+            func.count(EmployeeTaskModel.id).filter(
+                EmployeeTaskModel.status == TaskStatus.COMPLETED
+            ).label("completed")
+        ).where(
+            EmployeeTaskModel.employee_id.in_(employee_ids)
+        ).group_by(EmployeeTaskModel.employee_id)
+        stats_result = await session.execute(stats_stmt)
+        
+        return {
+            row.employee_id: EmployeeService._build_task_stats(row.total, row.completed)
+            for row in stats_result.all()
+        }
+    
     @staticmethod
     async def _get_employee_task_stats(session: AsyncSession, employee_id: str) -> Dict[str, Any]:
         """Get task statistics for an employee"""
-        tasks_stmt = select(EmployeeTaskModel).where(
-            EmployeeTaskModel.employee_id == employee_id
+        stats_by_employee = await EmployeeService._get_task_stats_for_employees(
+            session, [employee_id]
         )
-        tasks_result = await session.execute(tasks_stmt)
-        tasks = tasks_result.scalars().all()
-        
-        completed = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-        total = len(tasks)
-        
+        return stats_by_employee.get(employee_id, EmployeeService._build_task_stats(0, 0))
+    
+    @staticmethod
+    def _build_task_stats(total: int, completed: int) -> Dict[str, Any]:
+        """Build the task statistics payload from raw counts"""
         return {
             "total_tasks": total,
             "completed_tasks": completed,
@@ -174,10 +211,15 @@ class EmployeeService:
         
         if update_data.is_active is not None:
             employee.is_active = update_data.is_active
+            if not update_data.is_active:
+                # Deactivated users can't refresh their way back in
+                await session_store.revoke_user(session, employee_id)
         
         employee.updated_at = datetime.utcnow()
         await session.commit()
         await session.refresh(employee)
+        employee_context_cache.invalidate(employee_id)
+        invalidate_principal(employee_id)
         
         return employee
     
@@ -210,6 +252,19 @@ class EmployeeService:
         for training in training_result.scalars().all():
             await session.delete(training)
         
+        # Delete stored onboarding analysis
+        analysis = await session.get(OnboardingAnalysisModel, employee_id)
+        if analysis:
+            await session.delete(analysis)
+        
+        # Delete login sessions
+        await session_store.remove_user(session, employee_id)
+        
+        # Drop the employee's metrics rollup
+        await MetricsRollupService.remove_employee(session, employee_id)
+        
         # Delete employee
         await session.delete(employee)
         await session.commit()
+        employee_context_cache.invalidate(employee_id)
+        invalidate_principal(employee_id)
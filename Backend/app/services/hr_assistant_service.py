@@ -3,14 +3,31 @@ HR Natural Language Assistant
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, func, cast, String
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+import asyncio
 
 from .base_ai_service import BaseAIService
+from .intent_classifier import intent_classifier, INTENTS
+from ..core.ai_config import ai_config
+from ..database import get_read_sessionmaker
 from ..models.user import UserModel
 from ..models.document import DocumentModel
 from ..models.task import EmployeeTaskModel
 from ..core.enums import OnboardingStatus, VerificationStatus, TaskStatus
 
+# Intents that share a data source
+INTENT_DATA_SOURCES = {
+    "stuck_employees": "stuck_employees",
+    "pending_documents": "pending_documents",
+    "task_completion": "task_completion",
+}
+
+# Candidate data sources fetched speculatively while the LLM classifies a query
+SPECULATIVE_FETCHES = 2
+
+# Rows returned for list-style intents
+MAX_LIST_ROWS = 20
+
 class HRAssistantService(BaseAIService):
     """AI assistant for HR queries"""
     
@@ -22,18 +39,23 @@ class HRAssistantService(BaseAIService):
         """Process HR natural language query"""
         
         # Step 1: Classify the query intent
-        intent = await self._classify_query(query)
+        local_intent, confidence = intent_classifier.classify(query)
         
-        # Step 2: Fetch relevant data based on intent
-        data = await self._fetch_data_for_intent(intent, session)
+        if confidence >= ai_config.intent_confidence_threshold:
+            # Step 2: Fetch relevant data based on intent
+            intent = local_intent
+            data = await self._fetch_data_for_intent(intent, session)
+        else:
+            # Step 2: Fetch data for the likely intents while the LLM classifies
+            intent, data = await self._classify_and_fetch(query, local_intent, session)
         
         # Step 3: Generate natural language answer
         answer = await self._generate_answer(query, intent, data)
         
         return answer
     
-    async def _classify_query(self, query: str) -> str:
-        """Classify HR query intent"""
+    async def _classify_with_llm(self, query: str, fallback_intent: str) -> str:
+        """Ask the LLM for the intent, keeping fallback_intent if it returns an unknown label"""
         
         prompt = f"""
         Classify this HR query into one of these categories:
@@ -53,7 +75,59 @@ class HRAssistantService(BaseAIService):
         """
         
         result = await self.call_gemini(prompt, json_mode=True)
-        return result.get('intent', 'general_stats')
+        intent = result.get('intent')
+        
+        # Ignore labels outside the known set and keep the local guess
+        return intent if intent in INTENTS else fallback_intent
+    
+    async def _classify_and_fetch(
+        self,
+        query: str,
+        local_intent: str,
+        session: AsyncSession
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run LLM classification with speculative data fetches alongside it
+        The top-ranked data sources are fetched concurrently, each on its own
+        pooled session; unused fetches are cancelled once the intent is known.
+        """
+        candidates = []
+        for candidate in intent_classifier.rank(query):
+            source = self._data_source(candidate)
+            if source not in candidates:
+                candidates.append(source)
+        
+        speculative = {
+            source: asyncio.create_task(self._fetch_in_new_session(source))
+            for source in candidates[:SPECULATIVE_FETCHES]
+        }
+        
+        try:
+            intent = await self._classify_with_llm(query, local_intent)
+            source = self._data_source(intent)
+            
+            if source in speculative:
+                data = await speculative.pop(source)
+            else:
+                data = await self._fetch_data_for_intent(intent, session)
+        finally:
+            for task in speculative.values():
+                task.cancel()
+            # Wait for the cancelled fetches so their sessions are closed and errors retrieved
+            await asyncio.gather(*speculative.values(), return_exceptions=True)
+        
+        return intent, data
+    
+    @staticmethod
+    def _data_source(intent: str) -> str:
+        """Data source that serves an intent; other intents use the general stats"""
+        return INTENT_DATA_SOURCES.get(intent, "general_stats")
+    
+    async def _fetch_in_new_session(self, intent: str) -> Dict[str, Any]:
+        """Fetch intent data on a separate session so fetches can run concurrently"""
+        session_factory = await get_read_sessionmaker()
+        async with session_factory() as session:
+            return await self._fetch_data_for_intent(intent, session)
     
     async def _fetch_data_for_intent(
         self,
@@ -67,6 +141,7 @@ class HRAssistantService(BaseAIService):
             result = await session.execute(
                 select(UserModel)
                 .where(cast(UserModel.onboarding_status, String).in_(['BLOCKED', 'IN_PROGRESS']))
+                .limit(MAX_LIST_ROWS)
             )
             employees = result.scalars().all()
             
@@ -76,7 +151,7 @@ class HRAssistantService(BaseAIService):
                         "name": emp.name,
                         "status": emp.onboarding_status.value,
                         "notes": emp.onboarding_notes or "No notes"
-                    } for emp in employees[:20]
+                    } for emp in employees
                 ]
             }
         
@@ -86,6 +161,7 @@ class HRAssistantService(BaseAIService):
                 select(DocumentModel, UserModel)
                 .join(UserModel, DocumentModel.employee_id == UserModel.id)
                 .where(cast(DocumentModel.verification_status, String) == 'PENDING')
+                .limit(MAX_LIST_ROWS)
             )
             docs = result.all()
             
@@ -96,20 +172,19 @@ class HRAssistantService(BaseAIService):
                         "document_type": d[0].document_type.value,
                         "uploaded_at": str(d[0].uploaded_at),
                         "ai_confidence": d[0].ai_confidence_score or 0
-                    } for d in docs[:20]
+                    } for d in docs
                 ]
             }
         
         elif intent == "task_completion":
-            # Get task stats
-            total_result = await session.execute(select(func.count()).select_from(EmployeeTaskModel))
-            total_tasks = total_result.scalar() or 0
-            
-            completed_result = await session.execute(
-                select(func.count()).select_from(EmployeeTaskModel)
-                .where(cast(EmployeeTaskModel.status, String) == 'COMPLETED')
+            # Get task stats in one round trip
+            stats_result = await session.execute(
+                select(
+                    func.count(),
+                    func.count().filter(cast(EmployeeTaskModel.status, String) == 'COMPLETED')
+                ).select_from(EmployeeTaskModel)
             )
-            completed_tasks = completed_result.scalar() or 0
+            total_tasks, completed_tasks = stats_result.one()
             
             return {
                 "total_tasks": total_tasks,
@@ -118,16 +193,18 @@ class HRAssistantService(BaseAIService):
             }
         
         else:
-            # General stats
-            total_employees_result = await session.execute(select(func.count()).select_from(UserModel))
-            completed_onboarding_result = await session.execute(
-                select(func.count()).select_from(UserModel)
-                .where(cast(UserModel.onboarding_status, String) == 'COMPLETED')
+            # General stats in one round trip
+            stats_result = await session.execute(
+                select(
+                    func.count(),
+                    func.count().filter(cast(UserModel.onboarding_status, String) == 'COMPLETED')
+                ).select_from(UserModel)
             )
+            total_employees, completed_onboarding = stats_result.one()
             
             return {
-                "total_employees": total_employees_result.scalar() or 0,
-                "completed_onboarding": completed_onboarding_result.scalar() or 0
+                "total_employees": total_employees or 0,
+                "completed_onboarding": completed_onboarding or 0
             }
     
     async def _generate_answer(
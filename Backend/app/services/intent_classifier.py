@@ -0,0 +1,232 @@
+"""
+Intent Classifier - Local intent detection for HR assistant queries
+"""
+from typing import Dict, List, Tuple
+from collections import Counter
+import math
+import re
+
+# Intents understood by the HR assistant
+INTENTS = (
+    "stuck_employees",
+    "pending_documents",
+    "task_completion",
+    "employee_status",
+    "general_stats",
+)
+DEFAULT_INTENT = "general_stats"
+
+# Weighted keyword/regex rules per intent
+INTENT_RULES: Dict[str, List[Tuple[str, float]]] = {
+    "stuck_employees": [
+        (r"\bstuck\b", 2.0),
+        (r"\bblock(ed|ing|er|ers)?\b", 2.0),
+        (r"\b(delay(ed)?|behind|lagging|overdue|slow)\b", 1.5),
+        (r"\bnot (progress|moving|finish|complet)", 1.5),
+        (r"\bin[ -]progress\b", 1.0),
+    ],
+    "pending_documents": [
+        (r"\bdoc(ument)?s?\b", 1.5),
+        (r"\b(pan|aadhaar|aadhar|resume|offer letter|pf form|photo)\b", 1.5),
+        (r"\b(verif(y|ied|ication)|unverified|approv(e|al)|review)\b", 1.0),
+        (r"\bupload(s|ed)?\b", 1.0),
+        (r"\bpending\b", 0.5),
+    ],
+    "task_completion": [
+        (r"\btasks?\b", 2.0),
+        (r"\b(complet(e|ed|ion)|finish(ed)?|done)\b", 1.0),
+        (r"\b(progress|rate|percent(age)?)\b", 0.5),
+    ],
+    "employee_status": [
+        (r"\b(status|progress) of\b", 1.5),
+        (r"\bhow (is|are) \w+", 1.0),
+        (r"\b(where is|what about) \w+", 1.0),
+        (r"\b(specific|particular|this|that) (employee|person|hire)\b", 1.5),
+    ],
+    "general_stats": [
+        (r"\bhow many\b", 1.5),
+        (r"\b(total|overall|count|number of|summary|stats|statistics|metrics)\b", 1.5),
+        (r"\b(everyone|all employees|whole team|company)\b", 1.0),
+        (r"\bonboard(ed|ing)?\b", 0.5),
+    ],
+}
+
+# Example queries for the nearest-centroid model
+TRAINING_EXAMPLES: Dict[str, List[str]] = {
+    "stuck_employees": [
+        "which employees are stuck in onboarding",
+        "who is blocked",
+        "show delayed onboarding",
+        "employees falling behind on onboarding",
+        "who has not made progress this week",
+        "list people whose onboarding is blocked",
+    ],
+    "pending_documents": [
+        "which documents are pending verification",
+        "show unverified documents",
+        "who still needs to upload their pan card",
+        "documents waiting for review",
+        "list aadhaar uploads awaiting approval",
+        "any document issues to check",
+    ],
+    "task_completion": [
+        "what is the task completion rate",
+        "how many tasks are completed",
+        "task progress across the team",
+        "show completed versus pending tasks",
+        "are tasks getting done",
+    ],
+    "employee_status": [
+        "what is the status of jane",
+        "how is bob doing with onboarding",
+        "show progress of a specific employee",
+        "where is alice in her onboarding",
+        "details for this new hire",
+    ],
+    "general_stats": [
+        "how many employees do we have",
+        "give me an overview of onboarding",
+        "overall onboarding statistics",
+        "how many people finished onboarding",
+        "summary of hr metrics",
+        "total number of employees",
+    ],
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class IntentClassifier:
+    """
+    Classifies HR queries without an LLM call
+    Keyword/regex rules are tried first; a TF-IDF nearest-centroid model trained
+    on example queries handles phrasing the rules don't cover.
+    """
+    
+    def __init__(
+        self,
+        rules: Dict[str, List[Tuple[str, float]]] = INTENT_RULES,
+        examples: Dict[str, List[str]] = TRAINING_EXAMPLES,
+        use_model: bool = True
+    ):
+        self.rules = {
+            intent: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in patterns]
+            for intent, patterns in rules.items()
+        }
+        self.use_model = use_model and bool(examples)
+        self._idf: Dict[str, float] = {}
+        self._centroids: Dict[str, Dict[str, float]] = {}
+        if self.use_model:
+            self._train(examples)
+    
+    def classify(self, query: str) -> Tuple[str, float]:
+        """Return the most likely intent and a confidence between 0 and 1"""
+        rule_intent, rule_confidence = self._classify_by_rules(query)
+        if not self.use_model:
+            return rule_intent, rule_confidence
+        
+        model_intent, model_confidence = self._classify_by_model(query)
+        if rule_intent == model_intent:
+            # Agreement between both methods raises confidence
+            return rule_intent, round(min(1.0, max(rule_confidence, model_confidence) + 0.1), 3)
+        if rule_confidence >= model_confidence:
+            return rule_intent, rule_confidence
+        return model_intent, model_confidence
+    
+    def rank(self, query: str) -> List[str]:
+        """All intents ordered from most to least likely"""
+        rule_scores = self._rule_scores(query)
+        rule_total = sum(rule_scores.values()) or 1.0
+        model_scores = self._model_scores(query) if self.use_model else {}
+        
+        combined = {
+            intent: rule_scores.get(intent, 0.0) / rule_total + model_scores.get(intent, 0.0)
+            for intent in INTENTS
+        }
+        return sorted(INTENTS, key=lambda intent: combined[intent], reverse=True)
+    
+    def _rule_scores(self, query: str) -> Dict[str, float]:
+        """Sum of matching rule weights per intent"""
+        return {
+            intent: sum(weight for pattern, weight in patterns if pattern.search(query))
+            for intent, patterns in self.rules.items()
+        }
+    
+    def _model_scores(self, query: str) -> Dict[str, float]:
+        """Cosine similarity of the query's TF-IDF vector to each intent centroid"""
+        vector = self._vectorize(self._tokenize(query))
+        return {
+            intent: sum(weight * centroid.get(term, 0.0) for term, weight in vector.items())
+            for intent, centroid in self._centroids.items()
+        }
+    
+    def _classify_by_rules(self, query: str) -> Tuple[str, float]:
+        """Score each intent by the weights of its matching rules"""
+        scores = self._rule_scores(query)
+        total = sum(scores.values())
+        if total == 0:
+            return DEFAULT_INTENT, 0.0
+        
+        intent = max(scores, key=scores.get)
+        # Share of the evidence, discounted when only weak rules matched
+        confidence = (scores[intent] / total) * min(1.0, scores[intent] / 2.0)
+        return intent, round(confidence, 3)
+    
+    def _classify_by_model(self, query: str) -> Tuple[str, float]:
+        """Nearest intent centroid to the query"""
+        scores = self._model_scores(query)
+        if not any(scores.values()):
+            return DEFAULT_INTENT, 0.0
+        
+        similarities = sorted(
+            ((score, intent) for intent, score in scores.items()),
+            reverse=True
+        )
+        best_score, best_intent = similarities[0]
+        runner_up = similarities[1][0] if len(similarities) > 1 else 0.0
+        
+        # Confident only when the best centroid is both close and clearly ahead
+        confidence = best_score * min(1.0, (best_score - runner_up) / 0.15)
+        return best_intent, round(max(confidence, 0.0), 3)
+    
+    def _train(self, examples: Dict[str, List[str]]) -> None:
+        """Fit IDF weights and one normalised centroid per intent"""
+        documents = [
+            (intent, self._tokenize(text))
+            for intent, texts in examples.items()
+            for text in texts
+        ]
+        document_frequency = Counter(term for _, tokens in documents for term in set(tokens))
+        self._idf = {
+            term: math.log((1 + len(documents)) / (1 + frequency)) + 1
+            for term, frequency in document_frequency.items()
+        }
+        
+        for intent in examples:
+            centroid: Counter = Counter()
+            for example_intent, tokens in documents:
+                if example_intent == intent:
+                    centroid.update(self._vectorize(tokens))
+            self._centroids[intent] = self._normalize(centroid)
+    
+    def _vectorize(self, tokens: List[str]) -> Dict[str, float]:
+        """Normalised TF-IDF vector over known terms"""
+        counts = Counter(token for token in tokens if token in self._idf)
+        return self._normalize({term: count * self._idf[term] for term, count in counts.items()})
+    
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """Lowercase word tokens"""
+        return TOKEN_PATTERN.findall(text.lower())
+    
+    @staticmethod
+    def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+        """Scale a vector to unit length"""
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm == 0:
+            return {}
+        return {term: value / norm for term, value in vector.items()}
+
+
+# Singleton instance
+intent_classifier = IntentClassifier()
@@ -0,0 +1,323 @@
+"""
+Metrics Rollup Service - Maintains the materialised onboarding metrics
+
+Every write applies its delta to the employee's row and to the single "global"
+row in the same transaction, so concurrent writers queue on that one row lock
+until they commit. This is fine at onboarding write rates; if it becomes a
+bottleneck, split the global row into shards that writers pick at random and
+have readers sum them.
+"""
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from sqlalchemy import update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, func
+
+from ..database import upsert_statement
+from ..models.metrics import OnboardingMetricsModel, GLOBAL_METRICS_SCOPE
+from ..models.task import EmployeeTaskModel
+from ..models.training import EmployeeTrainingModel
+from ..models.document import DocumentModel
+from ..core.enums import TaskStatus, VerificationStatus
+
+# Counter columns held by every rollup row
+METRIC_FIELDS = (
+    "tasks_total",
+    "tasks_completed",
+    "tasks_pending",
+    "training_total",
+    "training_completed",
+    "documents_total",
+    "documents_pending",
+    "documents_verified",
+    "documents_rejected",
+    "documents_failed",
+)
+
+# Rollup counter tracking each document verification status
+DOCUMENT_STATUS_FIELDS = {
+    VerificationStatus.PENDING: "documents_pending",
+    VerificationStatus.VERIFIED: "documents_verified",
+    VerificationStatus.REJECTED: "documents_rejected",
+    VerificationStatus.FAILED: "documents_failed",
+}
+
+
+class MetricsRollupService:
+    """Service for reading and maintaining onboarding metric rollups"""
+    
+    @staticmethod
+    async def get_metrics(
+        session: AsyncSession,
+        employee_id: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Get rollup counters for an employee, or the global row when no employee is given
+        Read-only: a missing row is computed from the base tables but not stored,
+        so the caller keeps control of its transaction. Rows are seeded when users
+        are created; rebuild_all backfills any that are missing.
+        """
+        scope = employee_id or GLOBAL_METRICS_SCOPE
+        metrics_stmt = select(
+            *[getattr(OnboardingMetricsModel, field) for field in METRIC_FIELDS]
+        ).where(OnboardingMetricsModel.scope == scope)
+        metrics_result = await session.execute(metrics_stmt)
+        row = metrics_result.one_or_none()
+        
+        if row is not None:
+            return dict(row._mapping)
+        
+        counts = await MetricsRollupService._compute_counts(session, employee_id)
+        return counts.get(scope, MetricsRollupService._empty_counts())
+    
+    @staticmethod
+    def metrics_subquery(employee_id: Optional[str] = None):
+        """
+        Single-row subquery of rollup counters, for joining into other aggregate
+        statements so the rollup is read in the same round trip
+        """
+        scope = employee_id or GLOBAL_METRICS_SCOPE
+        return select(
+            *[getattr(OnboardingMetricsModel, field) for field in METRIC_FIELDS]
+        ).where(OnboardingMetricsModel.scope == scope).subquery()
+    
+    @staticmethod
+    async def resolve_metrics(
+        session: AsyncSession,
+        row: Any,
+        employee_id: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Extract rollup counters from a row that outer-joined metrics_subquery
+        Falls back to get_metrics (counting the base tables) when the rollup row is missing
+        """
+        if getattr(row, METRIC_FIELDS[0]) is None:
+            return await MetricsRollupService.get_metrics(session, employee_id)
+        return {field: getattr(row, field) for field in METRIC_FIELDS}
+    
+    @staticmethod
+    def add_employee(session: AsyncSession, employee_id: str) -> None:
+        """Create the zeroed rollup row for a new employee, in the caller's transaction"""
+        session.add(OnboardingMetricsModel(scope=employee_id))
+    
+    @staticmethod
+    async def apply_delta(
+        session: AsyncSession,
+        employee_id: str,
+        **deltas: int
+    ) -> None:
+        """
+        Apply counter deltas to an employee's rollup row and to the global row
+        Call after the base-table change has been made and before committing,
+        so the rollup is updated in the same transaction.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        
+        # Make the base-table change visible in case a row has to be rebuilt
+        await session.flush()
+        
+        for scope in (employee_id, GLOBAL_METRICS_SCOPE):
+            if not await MetricsRollupService._increment(session, scope, deltas):
+                # No rollup row yet; the base tables already include this change
+                await MetricsRollupService.rebuild_scope(session, scope)
+    
+    @staticmethod
+    async def apply_document_status_change(
+        session: AsyncSession,
+        employee_id: str,
+        old_status: Optional[VerificationStatus],
+        new_status: VerificationStatus
+    ) -> None:
+        """Move a document between verification status counters"""
+        if old_status == new_status:
+            return
+        
+        deltas: Dict[str, int] = {}
+        if old_status is None:
+            deltas["documents_total"] = 1
+        else:
+            deltas[DOCUMENT_STATUS_FIELDS[old_status]] = -1
+        new_field = DOCUMENT_STATUS_FIELDS[new_status]
+        deltas[new_field] = deltas.get(new_field, 0) + 1
+        
+        await MetricsRollupService.apply_delta(session, employee_id, **deltas)
+    
+    @staticmethod
+    async def remove_employee(session: AsyncSession, employee_id: str) -> None:
+        """Drop an employee's rollup row and subtract its counters from the global row"""
+        metrics_stmt = select(
+            *[getattr(OnboardingMetricsModel, field) for field in METRIC_FIELDS]
+        ).where(OnboardingMetricsModel.scope == employee_id)
+        metrics_result = await session.execute(metrics_stmt)
+        row = metrics_result.one_or_none()
+        
+        await session.flush()
+        if row is None:
+            # Nothing to subtract; recount the global row instead
+            await MetricsRollupService.rebuild_scope(session, GLOBAL_METRICS_SCOPE)
+            return
+        
+        await session.execute(
+            delete(OnboardingMetricsModel).where(
+                OnboardingMetricsModel.scope == employee_id
+            ).execution_options(synchronize_session=False)
+        )
+        
+        deltas = {field: -value for field, value in row._mapping.items() if value}
+        if deltas and not await MetricsRollupService._increment(
+            session, GLOBAL_METRICS_SCOPE, deltas
+        ):
+            await MetricsRollupService.rebuild_scope(session, GLOBAL_METRICS_SCOPE)
+    
+    @staticmethod
+    async def rebuild_scope(session: AsyncSession, scope: str) -> Dict[str, int]:
+        """Recompute one rollup row from the base tables and store it (without committing)"""
+        employee_id = None if scope == GLOBAL_METRICS_SCOPE else scope
+        counts = (await MetricsRollupService._compute_counts(session, employee_id)).get(
+            scope, MetricsRollupService._empty_counts()
+        )
+        await MetricsRollupService._store(session, scope, counts)
+        return counts
+    
+    @staticmethod
+    async def rebuild_all(session: AsyncSession, fix: bool = True) -> List[Dict[str, Any]]:
+        """
+        Compare every rollup row against the base tables
+        Returns the drifted scopes with stored vs actual values. When fix is
+        True drifted rows are rewritten, rows not created yet are backfilled,
+        and the session is committed.
+        """
+        actual = await MetricsRollupService._compute_counts(session)
+        
+        stored_result = await session.execute(
+            select(*[OnboardingMetricsModel.scope] + [
+                getattr(OnboardingMetricsModel, field) for field in METRIC_FIELDS
+            ])
+        )
+        stored = {
+            values.pop("scope"): values
+            for values in (dict(row._mapping) for row in stored_result.all())
+        }
+        
+        drift = []
+        for scope in sorted(set(actual) | set(stored)):
+            expected = actual.get(scope, MetricsRollupService._empty_counts())
+            current = stored.get(scope)
+            
+            if current is None:
+                # Not drift: employees without activity may predate the seeded rows
+                if fix:
+                    await MetricsRollupService._store(session, scope, expected)
+                continue
+            if current == expected:
+                continue
+            
+            drift.append({
+                "scope": scope,
+                "fields": {
+                    field: {"stored": current[field], "actual": expected[field]}
+                    for field in METRIC_FIELDS
+                    if current[field] != expected[field]
+                }
+            })
+            if fix:
+                await MetricsRollupService._store(session, scope, expected)
+        
+        if fix:
+            await session.commit()
+        
+        return drift
+    
+    @staticmethod
+    async def _increment(session: AsyncSession, scope: str, deltas: Dict[str, int]) -> bool:
+        """Add deltas to a rollup row in place; returns False if the row does not exist"""
+        update_stmt = update(OnboardingMetricsModel).where(
+            OnboardingMetricsModel.scope == scope
+        ).values(
+            updated_at=datetime.utcnow(),
+            **{
+                field: getattr(OnboardingMetricsModel, field) + delta
+                for field, delta in deltas.items()
+            }
+        ).execution_options(synchronize_session=False)
+        update_result = await session.execute(update_stmt)
+        return update_result.rowcount > 0
+    
+    @staticmethod
+    async def _store(session: AsyncSession, scope: str, counts: Dict[str, int]) -> None:
+        """Insert or overwrite a rollup row (upsert, so concurrent rebuilds don't collide)"""
+        await session.execute(
+            upsert_statement(
+                session,
+                OnboardingMetricsModel,
+                {"scope": scope, **counts, "updated_at": datetime.utcnow()},
+                key=["scope"]
+            )
+        )
+    
+    @staticmethod
+    def _empty_counts() -> Dict[str, int]:
+        """Counters for a scope with no activity"""
+        return {field: 0 for field in METRIC_FIELDS}
+    
+    @staticmethod
+    async def _compute_counts(
+        session: AsyncSession,
+        employee_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count the base tables, keyed by scope
+        With an employee_id only that employee is counted; otherwise every
+        employee with activity is counted along with the global totals.
+        """
+        task_stmt = select(
+            EmployeeTaskModel.employee_id,
+            func.count().label("tasks_total"),
+            func.count().filter(
+                EmployeeTaskModel.status == TaskStatus.COMPLETED
+            ).label("tasks_completed"),
+            func.count().filter(
+                EmployeeTaskModel.status == TaskStatus.PENDING
+            ).label("tasks_pending")
+        ).group_by(EmployeeTaskModel.employee_id)
+        
+        training_stmt = select(
+            EmployeeTrainingModel.employee_id,
+            func.count().label("training_total"),
+            func.count().filter(
+                EmployeeTrainingModel.status == TaskStatus.COMPLETED
+            ).label("training_completed")
+        ).group_by(EmployeeTrainingModel.employee_id)
+        
+        document_stmt = select(
+            DocumentModel.employee_id,
+            func.count().label("documents_total"),
+            *[
+                func.count().filter(DocumentModel.verification_status == doc_status).label(field)
+                for doc_status, field in DOCUMENT_STATUS_FIELDS.items()
+            ]
+        ).group_by(DocumentModel.employee_id)
+        
+        if employee_id:
+            task_stmt = task_stmt.where(EmployeeTaskModel.employee_id == employee_id)
+            training_stmt = training_stmt.where(EmployeeTrainingModel.employee_id == employee_id)
+            document_stmt = document_stmt.where(DocumentModel.employee_id == employee_id)
+        
+        counts: Dict[str, Dict[str, int]] = {}
+        for stmt in (task_stmt, training_stmt, document_stmt):
+            result = await session.execute(stmt)
+            for row in result.all():
+                values = dict(row._mapping)
+                scope = values.pop("employee_id")
+                counts.setdefault(scope, MetricsRollupService._empty_counts()).update(values)
+        
+        if not employee_id:
+            totals = MetricsRollupService._empty_counts()
+            for scope_counts in counts.values():
+                for field in METRIC_FIELDS:
+                    totals[field] += scope_counts[field]
+            counts[GLOBAL_METRICS_SCOPE] = totals
+        
+        return counts
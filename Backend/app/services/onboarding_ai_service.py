@@ -1,17 +1,29 @@
 """
 AI-powered Onboarding Analysis Service
 """
+from sqlalchemy import true, case
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, func
 from typing import Dict, Any
 from datetime import datetime
+import hashlib
+import json
 
 from .base_ai_service import BaseAIService
+from .onboarding_scoring import onboarding_scorer
 from ..models.user import UserModel
 from ..models.task import TaskModel, EmployeeTaskModel
 from ..models.document import DocumentModel
 from ..models.training import EmployeeTrainingModel
-from ..core.enums import TaskStatus, VerificationStatus, OnboardingStatus, EnrollmentStatus
+from ..models.onboarding import OnboardingAnalysisModel
+from ..core.enums import TaskStatus, VerificationStatus, OnboardingStatus, EnrollmentStatus, UserRole
+from ..core.ai_config import ai_config
+from ..core.context_cache import employee_context_cache
+from ..database import upsert_statement
+from ..auth import invalidate_principal
+
+# Bump when the analysis prompt or its inputs change, so stored analyses are redone
+ANALYSIS_VERSION = 2
 
 class OnboardingAIService(BaseAIService):
     """AI-powered onboarding status tracking"""
@@ -19,21 +31,122 @@ class OnboardingAIService(BaseAIService):
     async def analyze_employee_onboarding(
         self,
         employee_id: str,
-        session: AsyncSession
+        session: AsyncSession,
+        force: bool = False
     ) -> Dict[str, Any]:
-        """Comprehensive AI analysis of employee onboarding progress"""
+        """
+        Comprehensive analysis of employee onboarding progress
+        Status, completion and blockers are scored locally; the LLM only writes
+        the summary and next action. The stored analysis is returned while its
+        input fingerprint still matches, so reads make no LLM call and no writes;
+        force re-analyses.
+        """
         
-        # Step 1: Gather all onboarding data
+        # Step 1: Check whether the stored analysis is still current
+        fingerprint = await self._compute_fingerprint(employee_id, session)
+        stored_result = await session.execute(
+            select(
+                OnboardingAnalysisModel.fingerprint,
+                OnboardingAnalysisModel.analysis
+            ).where(OnboardingAnalysisModel.employee_id == employee_id)
+        )
+        stored = stored_result.first()
+        if not force and stored is not None and stored.fingerprint == fingerprint:
+            return json.loads(stored.analysis)
+        
+        # Step 2: Gather all onboarding data
         data = await self._gather_onboarding_data(employee_id, session)
         
-        # Step 2: Send to Gemini for analysis
-        analysis = await self._get_ai_analysis(data)
+        # Step 3: Score locally, then let Gemini phrase the narrative
+        analysis = onboarding_scorer.score(data)
+        if ai_config.onboarding_narrative:
+            analysis.update(await self._get_narrative(data, analysis))
+        
+        # Step 4: Store the analysis (upsert, as concurrent first analyses race on
+        # the insert) and update employee status based on it
+        await session.execute(
+            upsert_statement(
+                session,
+                OnboardingAnalysisModel,
+                {
+                    "employee_id": employee_id,
+                    "fingerprint": fingerprint,
+                    "analysis": json.dumps(analysis),
+                    "analyzed_at": datetime.utcnow()
+                },
+                key=["employee_id"]
+            )
+        )
         
-        # Step 3: Update employee status based on analysis
         await self._update_employee_status(employee_id, analysis, session)
         
         return analysis
     
+    async def _compute_fingerprint(self, employee_id: str, session: AsyncSession) -> str:
+        """
+        Hash of everything the analysis depends on, read in a single query
+        Covers the employee profile plus task, document and training counts and
+        their latest timestamps. The employee's own onboarding status is left
+        out since the analysis itself writes it.
+        """
+        employee_sq = select(
+            UserModel.name,
+            UserModel.role,
+            UserModel.updated_at
+        ).where(UserModel.id == employee_id).subquery()
+        
+        tasks_sq = select(
+            func.count().label("tasks_total"),
+            *[
+                func.count().filter(EmployeeTaskModel.status == task_status).label(f"tasks_{task_status.value}")
+                for task_status in TaskStatus
+            ],
+            func.max(EmployeeTaskModel.assigned_at).label("tasks_assigned_at"),
+            func.max(EmployeeTaskModel.completed_at).label("tasks_completed_at")
+        ).where(EmployeeTaskModel.employee_id == employee_id).subquery()
+        
+        documents_sq = select(
+            func.count().label("documents_total"),
+            *[
+                func.count().filter(DocumentModel.verification_status == doc_status).label(
+                    f"documents_{doc_status.value}"
+                )
+                for doc_status in VerificationStatus
+            ],
+            func.max(DocumentModel.uploaded_at).label("documents_uploaded_at"),
+            func.max(DocumentModel.verified_at).label("documents_verified_at"),
+            func.max(DocumentModel.ai_processed_at).label("documents_processed_at")
+        ).where(DocumentModel.employee_id == employee_id).subquery()
+        
+        training_sq = select(
+            func.count().label("training_total"),
+            *[
+                func.count().filter(EmployeeTrainingModel.status == training_status).label(
+                    f"training_{training_status.value}"
+                )
+                for training_status in TaskStatus
+            ],
+            func.coalesce(func.sum(EmployeeTrainingModel.progress_percentage), 0).label("training_progress"),
+            func.max(EmployeeTrainingModel.started_at).label("training_started_at"),
+            func.max(EmployeeTrainingModel.completed_at).label("training_completed_at")
+        ).where(EmployeeTrainingModel.employee_id == employee_id).subquery()
+        
+        fingerprint_stmt = select(
+            employee_sq, tasks_sq, documents_sq, training_sq
+        ).select_from(tasks_sq).join(
+            documents_sq, true()
+        ).join(
+            training_sq, true()
+        ).outerjoin(
+            employee_sq, true()
+        )
+        fingerprint_result = await session.execute(fingerprint_stmt)
+        inputs = dict(fingerprint_result.one()._mapping)
+        inputs["version"] = ANALYSIS_VERSION
+        
+        content = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+    
     async def _gather_onboarding_data(
         self,
         employee_id: str,
@@ -67,6 +180,10 @@ class OnboardingAIService(BaseAIService):
             .where(EmployeeTrainingModel.employee_id == employee_id)
         )
         training = training_result.scalars().all()
+        training_progress = [
+            100 if t.status == TaskStatus.COMPLETED else t.progress_percentage
+            for t in training
+        ]
         
         # Structure the data
         return {
@@ -105,52 +222,35 @@ class OnboardingAIService(BaseAIService):
                 "total": len(training),
                 "completed": len([t for t in training if t.status == EnrollmentStatus.COMPLETED]),
                 "in_progress": len([t for t in training if t.status == EnrollmentStatus.IN_PROGRESS]),
-                "not_started": len([t for t in training if t.status == EnrollmentStatus.NOT_STARTED])
+                "not_started": len([t for t in training if t.status == EnrollmentStatus.NOT_STARTED]),
+                "average_progress": sum(training_progress) / len(training_progress) if training else 0
             }
         }
     
-    async def _get_ai_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Get AI analysis of onboarding status"""
+    async def _get_narrative(self, data: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Ask Gemini for a readable summary and next action of a scored analysis
+        Returns only the fields the LLM produced; the locally generated text is
+        kept when the call fails or returns something unusable.
+        """
         
         prompt = f"""
-        Analyze this employee's onboarding progress:
+        Write a short onboarding progress note for this employee.
         
         Employee: {data['employee']['name']} ({data['employee']['role']})
-        Current Status: {data['employee']['onboarding_status']}
-        
-        Tasks:
-        - Total: {data['tasks']['total']}
-        - Completed: {data['tasks']['completed']}
-        - Pending: {data['tasks']['pending']}
-        
-        Documents:
-        - Total: {data['documents']['total']}
-        - Verified: {data['documents']['verified']}
-        - Pending: {data['documents']['pending']}
-        - Rejected: {data['documents']['rejected']}
-        
-        Training:
-        - Total: {data['training']['total']}
-        - Completed: {data['training']['completed']}
-        - In Progress: {data['training']['in_progress']}
-        
-        Determine:
-        1. Overall onboarding status (not_started / in_progress / completed / blocked)
-        2. What is blocking completion (if any)
-        3. Next steps for the employee
-        4. Estimated completion time
+        Status: {analysis['recommended_status']}
+        Completion: {analysis['completion_percentage']}%
+        Blockers: {', '.join(analysis['blockers']) or 'None'}
+        Completed steps: {', '.join(analysis['completed_steps']) or 'None'}
+        Pending steps: {', '.join(analysis['pending_steps']) or 'None'}
+        Facts: {analysis['summary']}
+        
+        Do not change the status or numbers above.
         
         Return JSON:
         {{
-            "recommended_status": "in_progress",
-            "completion_percentage": 65,
-            "blockers": ["Document verification pending"],
-            "completed_steps": ["Training", "Profile setup"],
-            "pending_steps": ["Document verification", "IT setup"],
-            "next_action": "Complete document verification",
-            "estimated_days_to_complete": 3,
             "summary": "Employee has completed training but documents are pending verification.",
-            "is_on_track": true
+            "next_action": "Complete document verification"
         }}
         """
         
@@ -160,7 +260,114 @@ class OnboardingAIService(BaseAIService):
             json_mode=True
         )
         
-        return result
+        return {
+            field: result[field]
+            for field in ("summary", "next_action")
+            if isinstance(result.get(field), str) and result[field].strip()
+        }
+    
+    async def score_all_employees(self, session: AsyncSession) -> Dict[str, int]:
+        """
+        Re-score every employee and update their onboarding status in one commit
+        Counts come from grouped aggregates rather than per-employee queries and
+        no LLM call is made, so the whole organisation can be recomputed on a
+        schedule. Returns the number of employees per status plus how many changed.
+        """
+        tasks_sq = select(
+            EmployeeTaskModel.employee_id,
+            func.count().label("tasks_total"),
+            func.count().filter(EmployeeTaskModel.status == TaskStatus.COMPLETED).label("tasks_completed"),
+            func.count().filter(EmployeeTaskModel.status == TaskStatus.PENDING).label("tasks_pending")
+        ).group_by(EmployeeTaskModel.employee_id).subquery()
+        
+        documents_sq = select(
+            DocumentModel.employee_id,
+            func.count().label("documents_total"),
+            func.count().filter(DocumentModel.verification_status == VerificationStatus.VERIFIED).label("documents_verified"),
+            func.count().filter(DocumentModel.verification_status == VerificationStatus.PENDING).label("documents_pending"),
+            func.count().filter(DocumentModel.verification_status == VerificationStatus.REJECTED).label("documents_rejected")
+        ).group_by(DocumentModel.employee_id).subquery()
+        
+        training_sq = select(
+            EmployeeTrainingModel.employee_id,
+            func.count().label("training_total"),
+            func.count().filter(EmployeeTrainingModel.status == TaskStatus.COMPLETED).label("training_completed"),
+            func.avg(
+                case(
+                    (EmployeeTrainingModel.status == TaskStatus.COMPLETED, 100),
+                    else_=EmployeeTrainingModel.progress_percentage
+                )
+            ).label("training_progress")
+        ).group_by(EmployeeTrainingModel.employee_id).subquery()
+        
+        counts_stmt = select(
+            UserModel,
+            *[func.coalesce(column, 0).label(column.name) for column in tasks_sq.c if column.name != "employee_id"],
+            *[func.coalesce(column, 0).label(column.name) for column in documents_sq.c if column.name != "employee_id"],
+            *[func.coalesce(column, 0).label(column.name) for column in training_sq.c if column.name != "employee_id"]
+        ).outerjoin(
+            tasks_sq, tasks_sq.c.employee_id == UserModel.id
+        ).outerjoin(
+            documents_sq, documents_sq.c.employee_id == UserModel.id
+        ).outerjoin(
+            training_sq, training_sq.c.employee_id == UserModel.id
+        ).where(UserModel.role == UserRole.EMPLOYEE)
+        counts_result = await session.execute(counts_stmt)
+        
+        summary: Dict[str, int] = {status.value.lower(): 0 for status in OnboardingStatus}
+        changed_ids = []
+        for row in counts_result.all():
+            employee = row[0]
+            analysis = onboarding_scorer.score({
+                "tasks": {
+                    "total": row.tasks_total,
+                    "completed": row.tasks_completed,
+                    "pending": row.tasks_pending
+                },
+                "documents": {
+                    "total": row.documents_total,
+                    "verified": row.documents_verified,
+                    "pending": row.documents_pending,
+                    "rejected": row.documents_rejected
+                },
+                "training": {
+                    "total": row.training_total,
+                    "completed": row.training_completed,
+                    "average_progress": float(row.training_progress)
+                }
+            })
+            
+            previous_status = employee.onboarding_status
+            self._apply_status(employee, analysis["recommended_status"])
+            if employee.onboarding_status != previous_status:
+                changed_ids.append(employee.id)
+            summary[analysis["recommended_status"]] += 1
+        
+        await session.commit()
+        if changed_ids:
+            employee_context_cache.clear()
+        # The cached current user includes onboarding_status
+        for employee_id in changed_ids:
+            invalidate_principal(employee_id)
+        
+        summary["changed"] = len(changed_ids)
+        return summary
+    
+    @staticmethod
+    def _apply_status(employee: UserModel, recommended_status: str) -> None:
+        """Set the onboarding status and its started/completed timestamps"""
+        try:
+            employee.onboarding_status = OnboardingStatus(recommended_status.upper())
+        except ValueError:
+            employee.onboarding_status = OnboardingStatus.IN_PROGRESS
+        
+        # Set completion timestamp if completed
+        if recommended_status == 'completed' and not employee.onboarding_completed_at:
+            employee.onboarding_completed_at = datetime.utcnow()
+        
+        # Set started timestamp if in progress
+        if recommended_status in ['in_progress', 'blocked'] and not employee.onboarding_started_at:
+            employee.onboarding_started_at = datetime.utcnow()
     
     async def _update_employee_status(
         self,
@@ -168,7 +375,7 @@ class OnboardingAIService(BaseAIService):
         analysis: Dict[str, Any],
         session: AsyncSession
     ):
-        """Update employee onboarding status based on AI analysis"""
+        """Update employee onboarding status based on the analysis"""
         
         employee_result = await session.execute(
             select(UserModel).where(UserModel.id == employee_id)
@@ -176,22 +383,12 @@ class OnboardingAIService(BaseAIService):
         employee = employee_result.scalar_one()
         
         # Update status
-        recommended_status = analysis.get('recommended_status', 'in_progress')
-        try:
-            employee.onboarding_status = OnboardingStatus(recommended_status)
-        except:
-            employee.onboarding_status = OnboardingStatus.IN_PROGRESS
+        self._apply_status(employee, analysis.get('recommended_status', 'in_progress'))
         
-        # Update notes with AI insights
+        # Update notes with the analysis summary
         employee.onboarding_notes = analysis.get('summary', '')[:500]
         
-        # Set completion timestamp if completed
-        if recommended_status == 'completed' and not employee.onboarding_completed_at:
-            employee.onboarding_completed_at = datetime.utcnow()
-        
-        # Set started timestamp if in progress
-        if recommended_status in ['in_progress', 'blocked'] and not employee.onboarding_started_at:
-            employee.onboarding_started_at = datetime.utcnow()
-        
         session.add(employee)
         await session.commit()
+        employee_context_cache.invalidate(employee_id)
+        invalidate_principal(employee_id)
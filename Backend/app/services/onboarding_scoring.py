@@ -0,0 +1,178 @@
+"""
+Onboarding Scoring - Deterministic onboarding status, completion and blockers
+"""
+from typing import Any, Dict, List
+import math
+
+# Share of overall completion carried by each onboarding component
+COMPONENT_WEIGHTS: Dict[str, float] = {
+    "tasks": 0.4,
+    "documents": 0.35,
+    "training": 0.25,
+}
+
+# Components counted even when nothing is assigned yet
+REQUIRED_COMPONENTS = ("documents",)
+
+# Step names shown in completed_steps / pending_steps
+COMPONENT_STEPS: Dict[str, str] = {
+    "tasks": "Onboarding tasks",
+    "documents": "Document verification",
+    "training": "Training",
+}
+
+# Remaining items an employee is expected to clear per day
+ITEMS_PER_DAY = 2
+
+
+class OnboardingScorer:
+    """
+    Computes onboarding status from task, document and training counts
+    The same counts always give the same result, so scores can be recomputed
+    for every employee in bulk without an LLM call.
+    """
+    
+    def __init__(
+        self,
+        weights: Dict[str, float] = COMPONENT_WEIGHTS,
+        required: tuple = REQUIRED_COMPONENTS,
+        items_per_day: int = ITEMS_PER_DAY
+    ):
+        self.weights = weights
+        self.required = required
+        self.items_per_day = items_per_day
+    
+    def score(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score one employee from gathered onboarding data
+        Expects the "tasks", "documents" and "training" count sections built by
+        OnboardingAIService; returns the analysis fields minus the narrative.
+        """
+        tasks = data["tasks"]
+        documents = data["documents"]
+        training = data["training"]
+        
+        progress = {
+            "tasks": self._ratio(tasks["completed"], tasks["total"]),
+            "documents": self._ratio(documents["verified"], documents["total"]),
+            "training": training.get("average_progress", 0) / 100 if training["total"] else 0.0,
+        }
+        totals = {"tasks": tasks["total"], "documents": documents["total"], "training": training["total"]}
+        counted = [
+            component for component in self.weights
+            if totals[component] or component in self.required
+        ]
+        
+        weight_total = sum(self.weights[component] for component in counted)
+        completion = 0
+        if weight_total:
+            completion = math.floor(
+                100 * sum(self.weights[component] * progress[component] for component in counted) / weight_total
+            )
+        
+        blockers = self._blockers(documents)
+        status = self._status(completion, blockers, tasks, documents, training)
+        remaining = (
+            tasks["total"] - tasks["completed"]
+            + max(documents["total"] - documents["verified"], 0)
+            + (0 if documents["total"] else 1)
+            + training["total"] - training["completed"]
+        )
+        
+        return {
+            "recommended_status": status,
+            "completion_percentage": completion,
+            "blockers": blockers,
+            "completed_steps": [
+                COMPONENT_STEPS[component] for component in counted if progress[component] >= 1
+            ],
+            "pending_steps": [
+                COMPONENT_STEPS[component] for component in counted if progress[component] < 1
+            ],
+            "next_action": self._next_action(tasks, documents, training),
+            "estimated_days_to_complete": math.ceil(remaining / self.items_per_day),
+            "summary": self._summary(completion, tasks, documents, training, blockers),
+            "is_on_track": status != "blocked",
+        }
+    
+    @staticmethod
+    def _ratio(done: int, total: int) -> float:
+        """Fraction done, 0 when nothing is assigned"""
+        return min(done / total, 1.0) if total else 0.0
+    
+    @staticmethod
+    def _blockers(documents: Dict[str, int]) -> List[str]:
+        """Issues that stop onboarding from completing without someone acting on them"""
+        blockers = []
+        if documents["rejected"]:
+            blockers.append(f"{documents['rejected']} rejected document(s) need to be re-uploaded")
+        if documents["pending"]:
+            blockers.append(f"{documents['pending']} document(s) awaiting verification")
+        return blockers
+    
+    @staticmethod
+    def _status(
+        completion: int,
+        blockers: List[str],
+        tasks: Dict[str, int],
+        documents: Dict[str, int],
+        training: Dict[str, Any]
+    ) -> str:
+        """not_started / in_progress / completed / blocked"""
+        started = (
+            tasks["completed"]
+            or documents["total"]
+            or training["completed"]
+            or training.get("average_progress", 0)
+        )
+        if not started:
+            return "not_started"
+        if documents["rejected"]:
+            return "blocked"
+        if completion >= 100 and not blockers:
+            return "completed"
+        return "in_progress"
+    
+    @staticmethod
+    def _next_action(
+        tasks: Dict[str, int],
+        documents: Dict[str, int],
+        training: Dict[str, Any]
+    ) -> str:
+        """Most pressing thing left to do"""
+        if documents["rejected"]:
+            return "Re-upload rejected documents"
+        if not documents["total"]:
+            return "Upload required documents"
+        if tasks["completed"] < tasks["total"]:
+            return "Complete pending onboarding tasks"
+        if training["completed"] < training["total"]:
+            return "Finish assigned training modules"
+        if documents["pending"]:
+            return "Wait for HR to verify uploaded documents"
+        if documents["verified"] < documents["total"]:
+            return "Ask HR to review unverified documents"
+        return "No action needed - onboarding is complete"
+    
+    @staticmethod
+    def _summary(
+        completion: int,
+        tasks: Dict[str, int],
+        documents: Dict[str, int],
+        training: Dict[str, Any],
+        blockers: List[str]
+    ) -> str:
+        """Plain-text progress summary, used when no narrative is generated"""
+        summary = (
+            f"Onboarding is {completion}% complete: "
+            f"{tasks['completed']}/{tasks['total']} tasks done, "
+            f"{documents['verified']}/{documents['total']} documents verified, "
+            f"{training['completed']}/{training['total']} training modules completed."
+        )
+        if blockers:
+            summary += " Blocked by: " + "; ".join(blockers) + "."
+        return summary
+
+
+# Singleton instance
+onboarding_scorer = OnboardingScorer()
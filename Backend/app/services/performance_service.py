@@ -1,15 +1,20 @@
 """
 Performance Service - Handles performance metrics and analytics
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import true
 from sqlmodel import select, func
 
 from ..models.user import UserModel
-from ..models.task import EmployeeTaskModel
+from ..models.task import TaskModel, EmployeeTaskModel
 from ..models.training import TrainingModuleModel, EmployeeTrainingModel
 from ..models.document import DocumentModel
-from ..core.enums import UserRole, TaskStatus, VerificationStatus
+from ..core.enums import UserRole, TaskStatus
+from .metrics_rollup_service import MetricsRollupService
+
+# Number of items returned in dashboard "recent activity" feeds
+RECENT_ACTIVITY_LIMIT = 10
 
 
 class PerformanceService:
@@ -17,79 +22,55 @@ class PerformanceService:
     
     @staticmethod
     async def get_overall_performance(session: AsyncSession) -> Dict[str, Any]:
-        """Get overall HR dashboard performance statistics"""
-        # Total employees
-        total_emp_stmt = select(func.count()).select_from(UserModel).where(
-            UserModel.role == UserRole.EMPLOYEE
-        )
-        total_emp_result = await session.execute(total_emp_stmt)
-        total_employees = total_emp_result.scalar()
-        
-        # Active employees
-        active_emp_stmt = select(func.count()).select_from(UserModel).where(
-            UserModel.role == UserRole.EMPLOYEE,
-            UserModel.is_active == True
-        )
-        active_emp_result = await session.execute(active_emp_stmt)
-        active_employees = active_emp_result.scalar()
-        
-        # Total tasks assigned
-        total_tasks_stmt = select(func.count()).select_from(EmployeeTaskModel)
-        total_tasks_result = await session.execute(total_tasks_stmt)
-        total_tasks_assigned = total_tasks_result.scalar()
-        
-        # Total tasks completed
-        completed_tasks_stmt = select(func.count()).select_from(EmployeeTaskModel).where(
-            EmployeeTaskModel.status == TaskStatus.COMPLETED
-        )
-        completed_tasks_result = await session.execute(completed_tasks_stmt)
-        total_tasks_completed = completed_tasks_result.scalar()
+        """
+        Get overall HR dashboard performance statistics
+        Live user and module counts are read together with the global metrics
+        rollup in a single round trip
+        """
+        users_stats = select(
+            func.count().filter(UserModel.role == UserRole.EMPLOYEE).label("total_employees"),
+            func.count().filter(
+                UserModel.role == UserRole.EMPLOYEE,
+                UserModel.is_active == True
+            ).label("active_employees")
+        ).select_from(UserModel).subquery()
+        
+        module_stats = select(
+            func.count().filter(
+                TrainingModuleModel.is_active == True
+            ).label("total_training_modules")
+        ).select_from(TrainingModuleModel).subquery()
+        
+        rollup = MetricsRollupService.metrics_subquery()
+        
+        stats_stmt = select(users_stats, module_stats, rollup).select_from(
+            users_stats
+        ).join(module_stats, true()).outerjoin(rollup, true())
+        stats_result = await session.execute(stats_stmt)
+        stats = stats_result.one()
+        metrics = await MetricsRollupService.resolve_metrics(session, stats)
         
         # Overall task completion rate
         overall_task_completion_rate = (
-            (total_tasks_completed / total_tasks_assigned * 100)
-            if total_tasks_assigned > 0 else 0
-        )
-        
-        # Total training modules
-        total_training_stmt = select(func.count()).select_from(TrainingModuleModel).where(
-            TrainingModuleModel.is_active == True
+            (metrics["tasks_completed"] / metrics["tasks_total"] * 100)
+            if metrics["tasks_total"] > 0 else 0
         )
-        total_training_result = await session.execute(total_training_stmt)
-        total_training_modules = total_training_result.scalar()
         
         # Average training completion
-        completed_training_stmt = select(func.count()).select_from(EmployeeTrainingModel).where(
-            EmployeeTrainingModel.status == TaskStatus.COMPLETED
-        )
-        completed_training_result = await session.execute(completed_training_stmt)
-        completed_training_count = completed_training_result.scalar()
-        
-        total_training_assignments_stmt = select(func.count()).select_from(EmployeeTrainingModel)
-        total_training_assignments_result = await session.execute(total_training_assignments_stmt)
-        total_training_assignments = total_training_assignments_result.scalar()
-        
         avg_training_completion = (
-            (completed_training_count / total_training_assignments * 100)
-            if total_training_assignments > 0 else 0
-        )
-        
-        # Pending documents
-        pending_docs_stmt = select(func.count()).select_from(DocumentModel).where(
-            DocumentModel.verification_status == VerificationStatus.PENDING
+            (metrics["training_completed"] / metrics["training_total"] * 100)
+            if metrics["training_total"] > 0 else 0
         )
-        pending_docs_result = await session.execute(pending_docs_stmt)
-        pending_documents = pending_docs_result.scalar()
         
         return {
-            "total_employees": total_employees,
-            "active_employees": active_employees,
-            "total_tasks_assigned": total_tasks_assigned,
-            "total_tasks_completed": total_tasks_completed,
+            "total_employees": stats.total_employees,
+            "active_employees": stats.active_employees,
+            "total_tasks_assigned": metrics["tasks_total"],
+            "total_tasks_completed": metrics["tasks_completed"],
             "overall_task_completion_rate": overall_task_completion_rate,
-            "total_training_modules": total_training_modules,
+            "total_training_modules": stats.total_training_modules,
             "avg_training_completion": avg_training_completion,
-            "pending_documents": pending_documents
+            "pending_documents": metrics["documents_pending"]
         }
     
     @staticmethod
@@ -168,46 +149,90 @@ class PerformanceService:
     ) -> Dict[str, Any]:
         """Get role-specific dashboard metrics"""
         if user_role.lower() == "hr":
-            # HR Dashboard
-            employees_stmt = select(UserModel).where(UserModel.role == UserRole.EMPLOYEE)
-            employees_result = await session.execute(employees_stmt)
-            total_employees = employees_result.scalars().all()
+            # HR Dashboard - live employee count plus the global metrics rollup
+            users_stats = select(
+                func.count().filter(UserModel.role == UserRole.EMPLOYEE).label("total_employees")
+            ).select_from(UserModel).subquery()
             
-            pending_tasks_stmt = select(EmployeeTaskModel).where(
-                EmployeeTaskModel.status == TaskStatus.PENDING
-            )
-            pending_tasks_result = await session.execute(pending_tasks_stmt)
-            pending_tasks = pending_tasks_result.scalars().all()
+            rollup = MetricsRollupService.metrics_subquery()
             
-            pending_docs_stmt = select(DocumentModel).where(
-                DocumentModel.verification_status == VerificationStatus.PENDING
+            stats_result = await session.execute(
+                select(users_stats, rollup).select_from(users_stats).outerjoin(rollup, true())
             )
-            pending_docs_result = await session.execute(pending_docs_stmt)
-            pending_documents = pending_docs_result.scalars().all()
+            stats = stats_result.one()
+            metrics = await MetricsRollupService.resolve_metrics(session, stats)
             
             return {
                 "role": "hr",
-                "total_employees": len(total_employees),
-                "pending_tasks": len(pending_tasks),
-                "pending_documents": len(pending_documents),
-                "recent_activities": []
+                "total_employees": stats.total_employees,
+                "pending_tasks": metrics["tasks_pending"],
+                "pending_documents": metrics["documents_pending"],
+                "recent_activities": await PerformanceService._get_recent_activities(session)
             }
         
         elif user_role.lower() == "employee":
-            # Employee Dashboard
-            user_tasks_stmt = select(EmployeeTaskModel).where(
-                EmployeeTaskModel.employee_id == employee_id
-            )
-            user_tasks_result = await session.execute(user_tasks_stmt)
-            user_tasks = user_tasks_result.scalars().all()
-            
-            completed_tasks = [task for task in user_tasks if task.status == TaskStatus.COMPLETED]
-            pending_tasks = [task for task in user_tasks if task.status == TaskStatus.PENDING]
+            # Employee Dashboard - served from the employee's metrics rollup
+            metrics = await MetricsRollupService.get_metrics(session, employee_id)
             
             return {
                 "role": "employee",
-                "total_tasks": len(user_tasks),
-                "completed_tasks": len(completed_tasks),
-                "pending_tasks": len(pending_tasks),
-                "completion_rate": len(completed_tasks) / len(user_tasks) * 100 if user_tasks else 0
+                "total_tasks": metrics["tasks_total"],
+                "completed_tasks": metrics["tasks_completed"],
+                "pending_tasks": metrics["tasks_pending"],
+                "completion_rate": (
+                    metrics["tasks_completed"] / metrics["tasks_total"] * 100
+                    if metrics["tasks_total"] > 0 else 0
+                )
             }
+    
+    @staticmethod
+    async def _get_recent_activities(
+        session: AsyncSession,
+        limit: int = RECENT_ACTIVITY_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """Get the most recent document uploads and task completions, newest first"""
+        uploads_stmt = select(
+            DocumentModel.employee_id,
+            UserModel.name,
+            DocumentModel.document_type,
+            DocumentModel.uploaded_at
+        ).join(
+            UserModel, DocumentModel.employee_id == UserModel.id
+        ).order_by(DocumentModel.uploaded_at.desc()).limit(limit)
+        uploads_result = await session.execute(uploads_stmt)
+        
+        completions_stmt = select(
+            EmployeeTaskModel.employee_id,
+            UserModel.name,
+            TaskModel.title,
+            EmployeeTaskModel.completed_at
+        ).join(
+            TaskModel, EmployeeTaskModel.task_id == TaskModel.id
+        ).join(
+            UserModel, EmployeeTaskModel.employee_id == UserModel.id
+        ).where(
+            EmployeeTaskModel.status == TaskStatus.COMPLETED,
+            EmployeeTaskModel.completed_at.is_not(None)
+        ).order_by(EmployeeTaskModel.completed_at.desc()).limit(limit)
+        completions_result = await session.execute(completions_stmt)
+        
+        activities = [
+            {
+                "type": "document_uploaded",
+                "employee_id": row.employee_id,
+                "employee_name": row.name,
+                "description": row.document_type.value,
+                "timestamp": row.uploaded_at
+            } for row in uploads_result.all()
+        ] + [
+            {
+                "type": "task_completed",
+                "employee_id": row.employee_id,
+                "employee_name": row.name,
+                "description": row.title,
+                "timestamp": row.completed_at
+            } for row in completions_result.all()
+        ]
+        activities.sort(key=lambda activity: activity["timestamp"], reverse=True)
+        
+        return activities[:limit]
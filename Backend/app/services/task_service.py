@@ -1,8 +1,9 @@
 """
 Task Service - Handles task management business logic
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable
 from datetime import datetime
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, func
 from fastapi import HTTPException, status
@@ -10,6 +11,8 @@ from fastapi import HTTPException, status
 from ..models.task import TaskModel, EmployeeTaskModel
 from ..schemas.task import TaskCreateSchema, TaskUpdateSchema
 from ..core.enums import TaskStatus
+from ..core.context_cache import employee_context_cache
+from .metrics_rollup_service import MetricsRollupService
 
 
 class TaskService:
@@ -72,10 +75,15 @@ class TaskService:
         employee_tasks_result = await session.execute(employee_tasks_stmt)
         employee_tasks = employee_tasks_result.scalars().all()
         
+        # Hydrate all task definitions for the page in one batch
+        tasks_by_id = await TaskService.get_tasks_by_ids(
+            session, [emp_task.task_id for emp_task in employee_tasks]
+        )
+        
         # Build task data with details
         task_data = []
         for emp_task in employee_tasks:
-            task = await session.get(TaskModel, emp_task.task_id)
+            task = tasks_by_id.get(emp_task.task_id)
             if task:
                 task_data.append({
                     "assignment_id": emp_task.id,
@@ -134,6 +142,34 @@ class TaskService:
             )
         return task
     
+    @staticmethod
+    async def get_tasks_by_ids(
+        session: AsyncSession,
+        task_ids: Iterable[str]
+    ) -> Dict[str, TaskModel]:
+        """
+        Get task definitions by ID, keyed by task ID
+        Tasks already loaded in the session are reused; the rest are
+        fetched with a single IN query. Unknown IDs are omitted.
+        """
+        tasks_by_id: Dict[str, TaskModel] = {}
+        missing_ids = set()
+        
+        for task_id in set(task_ids):
+            task = session.identity_map.get(session.identity_key(TaskModel, task_id))
+            if task is not None and not inspect(task).expired_attributes:
+                tasks_by_id[task_id] = task
+            else:
+                missing_ids.add(task_id)
+        
+        if missing_ids:
+            tasks_stmt = select(TaskModel).where(TaskModel.id.in_(missing_ids))
+            tasks_result = await session.execute(tasks_stmt)
+            for task in tasks_result.scalars().all():
+                tasks_by_id[task.id] = task
+        
+        return tasks_by_id
+    
     @staticmethod
     async def update_task(
         session: AsyncSession,
@@ -156,6 +192,9 @@ class TaskService:
         await session.commit()
         await session.refresh(task)
         
+        # Task details appear in every assignee's chat context
+        employee_context_cache.clear()
+        
         return task
     
     @staticmethod
@@ -168,12 +207,28 @@ class TaskService:
             EmployeeTaskModel.task_id == task_id
         )
         assignments_result = await session.execute(assignments_stmt)
+        removed_by_employee: Dict[str, Dict[str, int]] = {}
         for assignment in assignments_result.scalars().all():
+            status_field = (
+                "tasks_completed" if assignment.status == TaskStatus.COMPLETED else "tasks_pending"
+            )
+            removed = removed_by_employee.setdefault(
+                assignment.employee_id, {"tasks_total": 0, "tasks_completed": 0, "tasks_pending": 0}
+            )
+            removed["tasks_total"] -= 1
+            removed[status_field] -= 1
             await session.delete(assignment)
         
+        # Keep the metrics rollup in step with the removed assignments
+        for employee_id, deltas in removed_by_employee.items():
+            await MetricsRollupService.apply_delta(session, employee_id, **deltas)
+        
         # Delete task
         await session.delete(task)
         await session.commit()
+        
+        for employee_id in removed_by_employee:
+            employee_context_cache.invalidate(employee_id)
     
     @staticmethod
     async def assign_task_to_employee(
@@ -203,8 +258,12 @@ class TaskService:
         )
         
         session.add(assignment)
+        await MetricsRollupService.apply_delta(
+            session, employee_id, tasks_total=1, tasks_pending=1
+        )
         await session.commit()
         await session.refresh(assignment)
+        employee_context_cache.invalidate(employee_id)
         
         return assignment
     
@@ -223,10 +282,16 @@ class TaskService:
                 detail="Task assignment not found"
             )
         
+        was_completed = assignment.status == TaskStatus.COMPLETED
         assignment.status = TaskStatus.COMPLETED
         assignment.completed_at = datetime.utcnow()
         
+        if not was_completed:
+            await MetricsRollupService.apply_delta(
+                session, employee_id, tasks_completed=1, tasks_pending=-1
+            )
         await session.commit()
         await session.refresh(assignment)
+        employee_context_cache.invalidate(employee_id)
         
         return assignment
@@ -4,11 +4,12 @@ Training Service - Handles training module and progress management
 from typing import Dict, Any
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, func
+from sqlmodel import select, func, and_
 from fastapi import HTTPException, status
 
 from ..models.training import TrainingModuleModel, EmployeeTrainingModel
 from ..core.enums import TaskStatus
+from .metrics_rollup_service import MetricsRollupService
 
 
 class TrainingService:
@@ -29,7 +30,13 @@ class TrainingService:
         total_result = await session.execute(count_stmt)
         total = total_result.scalar()
         
-        # Get paginated modules
+        if employee_id:
+            # Include employee progress
+            return await TrainingService._build_employee_training_data(
+                session, employee_id, total, page, page_size
+            )
+        
+        # HR view - just modules
         offset = (page - 1) * page_size
         modules_stmt = select(TrainingModuleModel).where(
             TrainingModuleModel.is_active == True
@@ -37,61 +44,71 @@ class TrainingService:
         modules_result = await session.execute(modules_stmt)
         modules = modules_result.scalars().all()
         
-        if employee_id:
-            # Include employee progress
-            return await TrainingService._build_employee_training_data(
-                session, modules, employee_id, total, page, page_size
-            )
-        else:
-            # HR view - just modules
-            return {
-                "training_modules": [
-                    {
-                        "id": module.id,
-                        "title": module.title,
-                        "description": module.description,
-                        "content": module.content,
-                        "duration_minutes": module.duration_minutes,
-                        "is_mandatory": module.is_mandatory,
-                        "created_at": module.created_at
-                    } for module in modules
-                ],
-                "total": total,
-                "page": page,
-                "page_size": page_size
-            }
+        return {
+            "training_modules": [
+                {
+                    "id": module.id,
+                    "title": module.title,
+                    "description": module.description,
+                    "content": module.content,
+                    "duration_minutes": module.duration_minutes,
+                    "is_mandatory": module.is_mandatory,
+                    "created_at": module.created_at
+                } for module in modules
+            ],
+            "total": total,
+            "page": page,
+            "page_size": page_size
+        }
     
     @staticmethod
     async def _build_employee_training_data(
         session: AsyncSession,
-        modules: list,
         employee_id: str,
         total: int,
         page: int,
         page_size: int
     ) -> Dict[str, Any]:
-        """Build training data with employee progress"""
-        progress_data = []
-        
-        for module in modules:
-            progress_stmt = select(EmployeeTrainingModel).where(
-                EmployeeTrainingModel.employee_id == employee_id,
-                EmployeeTrainingModel.training_module_id == module.id
+        """
+        Build training data with employee progress
+        Modules are left-outer-joined to the employee's progress in one query,
+        selecting only the columns the catalog needs so rows stay plain tuples
+        """
+        offset = (page - 1) * page_size
+        rows_stmt = select(
+            TrainingModuleModel.id,
+            TrainingModuleModel.title,
+            TrainingModuleModel.description,
+            TrainingModuleModel.duration_minutes,
+            TrainingModuleModel.is_mandatory,
+            EmployeeTrainingModel.status,
+            EmployeeTrainingModel.progress_percentage,
+            EmployeeTrainingModel.started_at,
+            EmployeeTrainingModel.completed_at
+        ).outerjoin(
+            EmployeeTrainingModel,
+            and_(
+                EmployeeTrainingModel.training_module_id == TrainingModuleModel.id,
+                EmployeeTrainingModel.employee_id == employee_id
             )
-            progress_result = await session.execute(progress_stmt)
-            progress = progress_result.scalar_one_or_none()
-            
+        ).where(
+            TrainingModuleModel.is_active == True
+        ).offset(offset).limit(page_size)
+        rows_result = await session.execute(rows_stmt)
+        
+        progress_data = []
+        for row in rows_result.all():
             progress_data.append({
-                "id": module.id,
-                "title": module.title,
-                "description": module.description,
-                "duration_minutes": module.duration_minutes,
-                "is_mandatory": module.is_mandatory,
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "duration_minutes": row.duration_minutes,
+                "is_mandatory": row.is_mandatory,
                 "progress": {
-                    "status": progress.status.value if progress else "pending",
-                    "progress_percentage": progress.progress_percentage if progress else 0,
-                    "started_at": progress.started_at if progress else None,
-                    "completed_at": progress.completed_at if progress else None
+                    "status": row.status.value if row.status else "pending",
+                    "progress_percentage": row.progress_percentage or 0,
+                    "started_at": row.started_at,
+                    "completed_at": row.completed_at
                 }
             })
         
@@ -131,8 +148,15 @@ class TrainingService:
             if progress_percentage >= 100:
                 progress.completed_at = datetime.utcnow()
             session.add(progress)
+            await MetricsRollupService.apply_delta(
+                session,
+                employee_id,
+                training_total=1,
+                training_completed=1 if initial_status == TaskStatus.COMPLETED else 0
+            )
         else:
             # Update existing record
+            was_completed = progress.status == TaskStatus.COMPLETED
             progress.progress_percentage = progress_percentage
             
             # Mark as completed if 100%
@@ -141,6 +165,13 @@ class TrainingService:
                 progress.completed_at = datetime.utcnow()
             else:
                 progress.status = TaskStatus.PENDING
+            
+            is_completed = progress.status == TaskStatus.COMPLETED
+            await MetricsRollupService.apply_delta(
+                session,
+                employee_id,
+                training_completed=int(is_completed) - int(was_completed)
+            )
         
         await session.commit()
         await session.refresh(progress)
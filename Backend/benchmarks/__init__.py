@@ -0,0 +1 @@
+"""Benchmark scripts for HR Onboarding System"""
@@ -0,0 +1,82 @@
+"""
+Benchmark authenticated request throughput with and without the auth fast paths
+
+Runs the same requests with the principal cache disabled (a users-table lookup
+on every request, as before), with the principal cache, and with the cache
+plus AUTH_TRUST_TOKEN_CLAIMS role checks, reporting requests/sec and
+users-table statements per request.
+
+Usage:
+    python -m benchmarks.auth_throughput [--requests 1000] [--concurrency 10]
+"""
+from . import common
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+
+from app import auth
+from app.database import async_engine
+
+# GET /api/auth/me resolves the full user; the employee listing adds an HR role check
+ENDPOINTS = ["/api/auth/me", "/api/employees/?page_size=10"]
+
+
+async def measure(client, headers: Dict[str, str], path: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Requests/sec and users-table statements per request for one endpoint"""
+    user_queries = 0
+    
+    def count_user_queries(conn, cursor, statement, parameters, context, executemany):
+        nonlocal user_queries
+        if "FROM users" in statement:
+            user_queries += 1
+    
+    remaining = iter(range(requests))
+    
+    async def user() -> None:
+        for _ in remaining:
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_user_queries)
+    started = time.perf_counter()
+    await asyncio.gather(*[user() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count_user_queries)
+    
+    return {"req_per_s": round(requests / elapsed, 1), "users_queries_per_req": round(user_queries / requests, 2)}
+
+
+async def main(requests: int, concurrency: int) -> None:
+    seeded = await common.seed(200)
+    headers = await common.auth_headers(seeded["hr_id"])
+    
+    modes = [
+        ("no cache (before)", 0, False),
+        ("principal cache", auth.PRINCIPAL_CACHE_TTL or 30, False),
+        ("cache + token claims", auth.PRINCIPAL_CACHE_TTL or 30, True),
+    ]
+    
+    rows = []
+    async with common.api_client() as client:
+        for path in ENDPOINTS:
+            await measure(client, headers, path, 20, concurrency)  # warm up
+            for label, cache_ttl, trust_claims in modes:
+                auth.principal_cache.ttl = cache_ttl
+                auth.principal_cache.clear()
+                auth.TRUST_TOKEN_CLAIMS = trust_claims
+                rows.append({"endpoint": path, "mode": label, **await measure(client, headers, path, requests, concurrency)})
+    
+    common.print_table(f"{requests} requests per row, {concurrency} concurrent clients", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark authenticated request throughput")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.requests, args.concurrency))
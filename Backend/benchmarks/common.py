@@ -0,0 +1,153 @@
+"""
+Shared setup for the benchmark scripts
+Benchmarks run against a temporary SQLite database with AI in mock mode, so
+absolute timings are indicative only; query counts and before/after ratios
+are what to compare. Import this module before anything from app.
+"""
+import os
+import tempfile
+
+# Must be set before the app is imported, since the engine is created at import time.
+# A long busy timeout lets SQLite writers queue behind each other instead of failing
+_db_dir = tempfile.mkdtemp(prefix="hr-onboarding-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db?timeout=120"
+os.environ.setdefault("AI_MODE", "mock")
+
+import math
+import time
+import uuid
+from typing import Any, Dict, List, Sequence
+
+import httpx
+from sqlalchemy import event, insert
+from sqlmodel import SQLModel
+
+from app.database import async_engine, AsyncSessionLocal
+from app.models.user import UserModel
+from app.models.task import TaskModel, EmployeeTaskModel
+from app.models.training import TrainingModuleModel, EmployeeTrainingModel
+from app.models.document import DocumentModel
+from app.core.enums import UserRole, TaskStatus, TaskType, DocumentType, VerificationStatus
+from app.services.auth_service import AuthService
+from app.services.metrics_rollup_service import MetricsRollupService
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the app engine while active"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+    
+    def __enter__(self) -> "QueryCounter":
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._record)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self._record)
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/max of latency samples in seconds, reported in milliseconds"""
+    ordered = sorted(samples)
+    
+    def pick(fraction: float) -> float:
+        index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 2)
+    
+    return {"p50_ms": pick(0.5), "p95_ms": pick(0.95), "max_ms": round(ordered[-1] * 1000, 2)}
+
+
+async def timed(coro) -> float:
+    """Await a coroutine and return how long it took, in seconds"""
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def reset_database() -> None:
+    """Recreate every table"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+async def seed(employees: int, tasks: int = 5, modules: int = 3, password_hash: str = "x") -> Dict[str, Any]:
+    """
+    Fill the database with one HR user and employees with tasks, training and a document each
+    Rows are bulk inserted and the metrics rollup rebuilt afterwards.
+    Returns the HR user and employee IDs.
+    """
+    await reset_database()
+    
+    hr_id = str(uuid.uuid4())
+    employee_ids = [str(uuid.uuid4()) for _ in range(employees)]
+    task_ids = [str(uuid.uuid4()) for _ in range(tasks)]
+    module_ids = [str(uuid.uuid4()) for _ in range(modules)]
+    
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(UserModel), [
+            {"id": hr_id, "name": "HR", "email": "hr@example.com",
+             "password_hash": password_hash, "role": UserRole.HR},
+            *[
+                {"id": employee_id, "name": f"Employee {i}", "email": f"employee{i}@example.com",
+                 "password_hash": password_hash, "role": UserRole.EMPLOYEE}
+                for i, employee_id in enumerate(employee_ids)
+            ]
+        ])
+        await session.execute(insert(TaskModel), [
+            {"id": task_id, "title": f"Task {i}", "task_type": TaskType.READ, "content": "Read"}
+            for i, task_id in enumerate(task_ids)
+        ])
+        await session.execute(insert(TrainingModuleModel), [
+            {"id": module_id, "title": f"Module {i}", "content": "Learn"}
+            for i, module_id in enumerate(module_ids)
+        ])
+        await session.execute(insert(EmployeeTaskModel), [
+            {"employee_id": employee_id, "task_id": task_id,
+             "status": TaskStatus.COMPLETED if (i + j) % 2 else TaskStatus.PENDING}
+            for i, employee_id in enumerate(employee_ids)
+            for j, task_id in enumerate(task_ids)
+        ])
+        await session.execute(insert(EmployeeTrainingModel), [
+            {"employee_id": employee_id, "training_module_id": module_id,
+             "status": TaskStatus.COMPLETED if (i + j) % 2 else TaskStatus.PENDING, "progress_percentage": 50}
+            for i, employee_id in enumerate(employee_ids)
+            for j, module_id in enumerate(module_ids)
+        ])
+        await session.execute(insert(DocumentModel), [
+            {"employee_id": employee_id, "document_type": DocumentType.PAN, "original_filename": "pan.pdf",
+             "file_path": "/nonexistent/pan.pdf", "mime_type": "application/pdf",
+             "verification_status": VerificationStatus.PENDING}
+            for employee_id in employee_ids
+        ])
+        await session.commit()
+        
+        await MetricsRollupService.rebuild_all(session)
+    
+    return {"hr_id": hr_id, "employee_ids": employee_ids}
+
+
+async def auth_headers(user_id: str) -> Dict[str, str]:
+    """Bearer token header for a seeded user"""
+    async with AsyncSessionLocal() as session:
+        user = await session.get(UserModel, user_id)
+    return {"Authorization": f"Bearer {AuthService._create_user_access_token(user)}"}
+
+
+def api_client() -> httpx.AsyncClient:
+    """HTTP client calling the app in-process"""
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+def print_table(title: str, rows: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as aligned columns"""
+    print(f"\n{title}")
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
@@ -0,0 +1,104 @@
+"""
+Load test: /api/dashboard latency while Gemini calls are in flight
+
+A fake Gemini model answers after a fixed delay. In "blocking" mode it sleeps
+on the event loop thread, the way the SDK's synchronous generate_content used
+to; in "async" mode it awaits, like the SDK's async client call_gemini uses
+now. Dashboard requests are measured with no AI load, then with each mode.
+
+Usage:
+    python -m benchmarks.dashboard_under_ai_load [--ai-calls 20] [--ai-latency 0.5] [--requests 200]
+"""
+from . import common
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict
+
+from app.core.ai_config import AIConfig
+from app.services.base_ai_service import BaseAIService
+
+
+class FakeResponse:
+    """Stand-in for a Gemini response"""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Answers after a fixed delay, either blocking the event loop or not"""
+    
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+    
+    async def generate_content_async(self, prompt: str, generation_config=None) -> FakeResponse:
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return FakeResponse('{"ok": true}')
+
+
+async def measure_dashboard(client, headers: Dict[str, str], requests: int, concurrency: int = 10) -> Dict[str, Any]:
+    """Latency percentiles for dashboard requests issued by a few concurrent clients"""
+    samples = []
+    remaining = iter(range(requests))
+    
+    async def user() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get("/api/dashboard/", headers=headers)
+            response.raise_for_status()
+            samples.append(time.perf_counter() - started)
+    
+    await asyncio.gather(*[user() for _ in range(concurrency)])
+    return common.percentiles(samples)
+
+
+async def measure_with_ai_load(client, headers, mode: str, ai_calls: int, ai_latency: float, requests: int):
+    """Dashboard latency while ai_calls Gemini requests run alongside"""
+    AIConfig._gemini_model = FakeGeminiModel(ai_latency, blocking=mode == "blocking")
+    service = BaseAIService()
+    
+    # Distinct prompts, so the response cache and single-flight don't collapse them
+    ai_load = asyncio.gather(*[
+        service.call_gemini(f"{mode} prompt {i}", fallback=False) for i in range(ai_calls)
+    ])
+    dashboard = await measure_dashboard(client, headers, requests)
+    await ai_load
+    return dashboard
+
+
+async def main(ai_calls: int, ai_latency: float, requests: int) -> None:
+    seeded = await common.seed(200)
+    headers = await common.auth_headers(seeded["hr_id"])
+    
+    # Live mode against the fake model; the cache is off so every call reaches it
+    AIConfig._gemini_model = FakeGeminiModel(ai_latency, blocking=False)
+    AIConfig._mock_mode = False
+    AIConfig.cache_backend = "none"
+    AIConfig._llm_cache = None
+    
+    async with common.api_client() as client:
+        await measure_dashboard(client, headers, 20)  # warm up
+        rows = [{"ai_load": "none", **await measure_dashboard(client, headers, requests)}]
+        for mode in ("blocking", "async"):
+            rows.append({
+                "ai_load": f"{ai_calls} x {ai_latency}s {mode}",
+                **await measure_with_ai_load(client, headers, mode, ai_calls, ai_latency, requests)
+            })
+    
+    common.print_table(f"GET /api/dashboard/ (HR), {requests} requests, 10 concurrent clients", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard latency under concurrent AI load")
+    parser.add_argument("--ai-calls", type=int, default=20)
+    parser.add_argument("--ai-latency", type=float, default=0.5)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.ai_calls, args.ai_latency, args.requests))
@@ -0,0 +1,85 @@
+"""
+Benchmark the HR employee listing (GET /api/employees)
+
+Compares the grouped task-stats query used by EmployeeService.get_all_employees
+with the previous strategy of loading every task row per employee on the page.
+
+Usage:
+    python -m benchmarks.employee_listing [--employees 10000] [--page-size 50] [--runs 30]
+"""
+from . import common
+
+import argparse
+import asyncio
+from typing import Any, Dict
+
+from sqlmodel import select, func
+
+from app.database import AsyncSessionLocal
+from app.models.user import UserModel
+from app.models.task import EmployeeTaskModel
+from app.core.enums import UserRole, TaskStatus
+from app.services.employee_service import EmployeeService
+
+
+async def list_employees_per_employee(session, page: int, page_size: int) -> Dict[str, Any]:
+    """The previous listing: one task query per employee, counted in Python"""
+    total_result = await session.execute(
+        select(func.count()).select_from(UserModel).where(UserModel.role == UserRole.EMPLOYEE)
+    )
+    employees_result = await session.execute(
+        select(UserModel).where(UserModel.role == UserRole.EMPLOYEE).offset((page - 1) * page_size).limit(page_size)
+    )
+    employee_data = []
+    for employee in employees_result.scalars().all():
+        tasks_result = await session.execute(
+            select(EmployeeTaskModel).where(EmployeeTaskModel.employee_id == employee.id)
+        )
+        tasks = tasks_result.scalars().all()
+        completed = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
+        employee_data.append({
+            "id": employee.id,
+            "name": employee.name,
+            "email": employee.email,
+            "is_active": employee.is_active,
+            "total_tasks": len(tasks),
+            "completed_tasks": completed,
+            "completion_rate": completed / len(tasks) * 100 if tasks else 0
+        })
+    return {"employees": employee_data, "total": total_result.scalar(), "page": page, "page_size": page_size}
+
+
+async def measure(listing, page_size: int, runs: int) -> Dict[str, Any]:
+    """Latency percentiles and statements per call for one listing strategy"""
+    samples = []
+    for run in range(runs):
+        async with AsyncSessionLocal() as session:
+            with common.QueryCounter() as queries:
+                samples.append(await common.timed(listing(session, run % 10 + 1, page_size)))
+    return {"queries": queries.count, **common.percentiles(samples)}
+
+
+async def main(employees: int, page_size: int, runs: int) -> None:
+    print(f"Seeding {employees} employees...")
+    await common.seed(employees)
+    
+    # Both strategies must return the same payload
+    async with AsyncSessionLocal() as session:
+        expected = await list_employees_per_employee(session, 1, page_size)
+        actual = await EmployeeService.get_all_employees(session, 1, page_size)
+    assert expected == actual, "listing strategies disagree"
+    
+    common.print_table(f"GET /api/employees, page_size={page_size}, {runs} runs", [
+        {"strategy": "per-employee (before)", **await measure(list_employees_per_employee, page_size, runs)},
+        {"strategy": "grouped query (after)", **await measure(EmployeeService.get_all_employees, page_size, runs)},
+    ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the employee listing")
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.employees, args.page_size, args.runs))
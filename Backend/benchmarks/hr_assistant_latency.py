@@ -0,0 +1,150 @@
+"""
+Benchmark end-to-end latency of POST /api/assistant/hr/ask
+
+Compares the current pipeline (local intent classification, speculative data
+fetches alongside LLM classification, single-round-trip counts) with the
+previous serial flow: LLM classify -> sequential count queries -> answer.
+Gemini is a fake model with a fixed delay, and every database statement gets
+a simulated network round trip, since the local SQLite database has none.
+
+Usage:
+    python -m benchmarks.hr_assistant_latency [--runs 40] [--llm-latency 0.15] [--db-latency 0.005]
+"""
+from . import common
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, func, cast, String
+
+from app.core.ai_config import AIConfig
+from app.models.user import UserModel
+from app.models.task import EmployeeTaskModel
+from app.routers import assistants
+from app.services.hr_assistant_service import HRAssistantService
+
+QUERIES = [
+    "How many employees have finished onboarding?",
+    "What is the task completion rate?",
+    "Which documents are still waiting for verification?",
+    "Give me an overview",
+]
+
+
+class FakeResponse:
+    """Stand-in for a Gemini response"""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Classifies everything as general_stats and answers after a fixed delay"""
+    
+    model_name = "fake"
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    async def generate_content_async(self, prompt: str, generation_config=None) -> FakeResponse:
+        await asyncio.sleep(self.latency)
+        if "Classify this HR query" in prompt:
+            return FakeResponse('{"intent": "general_stats", "confidence": 0.9}')
+        return FakeResponse('{"answer": "ok", "data_summary": "", "actionable_items": []}')
+
+
+class SerialHRAssistant(HRAssistantService):
+    """The previous flow: always ask the LLM for the intent, then fetch, then answer"""
+    
+    async def answer_query(self, query: str, session: AsyncSession) -> Dict[str, Any]:
+        intent = await self._classify_with_llm(query, "general_stats")
+        data = await self._fetch_data_for_intent(intent, session)
+        return await self._generate_answer(query, intent, data)
+    
+    async def _fetch_data_for_intent(self, intent: str, session: AsyncSession) -> Dict[str, Any]:
+        if intent == "task_completion":
+            total_result = await session.execute(select(func.count()).select_from(EmployeeTaskModel))
+            completed_result = await session.execute(
+                select(func.count()).select_from(EmployeeTaskModel)
+                .where(cast(EmployeeTaskModel.status, String) == 'COMPLETED')
+            )
+            total_tasks, completed_tasks = total_result.scalar() or 0, completed_result.scalar() or 0
+            return {
+                "total_tasks": total_tasks,
+                "completed_tasks": completed_tasks,
+                "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+            }
+        if intent in ("stuck_employees", "pending_documents"):
+            return await super()._fetch_data_for_intent(intent, session)
+        
+        total_result = await session.execute(select(func.count()).select_from(UserModel))
+        completed_result = await session.execute(
+            select(func.count()).select_from(UserModel)
+            .where(cast(UserModel.onboarding_status, String) == 'COMPLETED')
+        )
+        return {
+            "total_employees": total_result.scalar() or 0,
+            "completed_onboarding": completed_result.scalar() or 0
+        }
+
+
+def add_db_latency(latency: float) -> None:
+    """Delay every statement by a simulated network round trip, without blocking the loop"""
+    execute = AsyncSession.execute
+    
+    async def execute_with_latency(self, *args, **kwargs):
+        await asyncio.sleep(latency)
+        return await execute(self, *args, **kwargs)
+    
+    AsyncSession.execute = execute_with_latency
+
+
+async def measure(client, headers: Dict[str, str], query: str, runs: int) -> Dict[str, float]:
+    """Latency percentiles for one query asked repeatedly"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await client.post("/api/assistant/hr/ask", json={"query": query}, headers=headers)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+    return common.percentiles(samples)
+
+
+async def main(runs: int, llm_latency: float, db_latency: float) -> None:
+    seeded = await common.seed(500)
+    headers = await common.auth_headers(seeded["hr_id"])
+    
+    # Live mode against the fake model; the cache is off so every call reaches it
+    AIConfig._gemini_model = FakeGeminiModel(llm_latency)
+    AIConfig._mock_mode = False
+    AIConfig.cache_backend = "none"
+    AIConfig._llm_cache = None
+    add_db_latency(db_latency)
+    
+    pipelined = HRAssistantService()
+    serial = SerialHRAssistant()
+    
+    rows = []
+    async with common.api_client() as client:
+        for query in QUERIES:
+            for label, service in (("serial (before)", serial), ("pipelined (after)", pipelined)):
+                assistants.hr_assistant = service
+                rows.append({"query": query[:40], "flow": label, **await measure(client, headers, query, runs)})
+    
+    common.print_table(
+        f"POST /api/assistant/hr/ask, {runs} runs, LLM {llm_latency * 1000:.0f} ms, DB {db_latency * 1000:.0f} ms",
+        rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HR assistant answer latency")
+    parser.add_argument("--runs", type=int, default=40)
+    parser.add_argument("--llm-latency", type=float, default=0.15)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.runs, args.llm_latency, args.db_latency))
@@ -0,0 +1,87 @@
+"""
+Benchmark concurrent logins and their effect on other endpoints
+
+Runs a burst of concurrent logins while a probe client keeps requesting the
+employee dashboard, first with bcrypt verification inline on the event loop
+(as before) and then on the password hashing pool. Reports login throughput
+and the probe's latency during the burst.
+
+Usage:
+    python -m benchmarks.login_throughput [--logins 50]
+"""
+from . import common
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from app import auth
+from app.auth import get_password_hash
+
+PASSWORD = "benchmark-password"
+
+
+async def inline_verify(plain_password: str, hashed_password: str) -> bool:
+    """The previous behaviour: bcrypt on the event loop thread"""
+    return auth.verify_password(plain_password, hashed_password)
+
+
+async def probe(client, headers: Dict[str, str], samples: List[float], stop: asyncio.Event) -> None:
+    """Request the dashboard in a loop until stopped, recording latency"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/dashboard/", headers=headers)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+
+
+async def measure(client, headers: Dict[str, str], logins: int) -> Dict[str, Any]:
+    """Login throughput and dashboard latency while the logins run"""
+    async def login(i: int) -> None:
+        response = await client.post(
+            "/api/auth/login",
+            json={"email": f"employee{i}@example.com", "password": PASSWORD}
+        )
+        response.raise_for_status()
+    
+    samples: List[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, headers, samples, stop))
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[login(i) for i in range(logins)])
+    elapsed = time.perf_counter() - started
+    
+    stop.set()
+    await probe_task
+    return {
+        "logins_per_s": round(logins / elapsed, 1),
+        "probe_requests": len(samples),
+        **{f"probe_{name}": value for name, value in common.percentiles(samples).items()}
+    }
+
+
+async def main(logins: int) -> None:
+    seeded = await common.seed(logins, password_hash=get_password_hash(PASSWORD))
+    headers = await common.auth_headers(seeded["employee_ids"][0])
+    
+    pooled_verify = auth.verify_password_async
+    rows = []
+    async with common.api_client() as client:
+        for label, verify in (("inline (before)", inline_verify), (f"pool of {auth.PASSWORD_HASH_WORKERS}", pooled_verify)):
+            auth.verify_password_async = verify
+            rows.append({"bcrypt": label, **await measure(client, headers, logins)})
+    auth.verify_password_async = pooled_verify
+    
+    common.print_table(f"{logins} concurrent logins, GET /api/dashboard/ probed during the burst", rows)
+    auth.password_executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent login throughput")
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.logins))
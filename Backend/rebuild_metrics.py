@@ -0,0 +1,49 @@
+"""
+Rebuild the onboarding metrics rollup from the base tables
+
+Usage:
+    python rebuild_metrics.py           # report drift and rewrite drifted rows
+    python rebuild_metrics.py --check   # report drift only, exit 1 if any is found
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database import create_db_and_tables, AsyncSessionLocal
+from app.services.metrics_rollup_service import MetricsRollupService
+
+
+async def rebuild_metrics(check_only: bool) -> int:
+    """Compare the rollup against the base tables and optionally fix it"""
+    await create_db_and_tables()
+    
+    async with AsyncSessionLocal() as session:
+        drift = await MetricsRollupService.rebuild_all(session, fix=not check_only)
+    
+    if not drift:
+        print("✅ Metrics rollup is in sync with the base tables.")
+        return 0
+    
+    print(f"⚠️ {len(drift)} rollup row(s) drifted:")
+    for entry in drift:
+        print(f"   {entry['scope']}")
+        for field, values in entry["fields"].items():
+            print(f"   └─ {field}: stored={values['stored']} actual={values['actual']}")
+    
+    if check_only:
+        return 1
+    
+    print("✅ Drifted rows rebuilt.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the onboarding metrics rollup")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report drift, do not rewrite the rollup"
+    )
+    args = parser.parse_args()
+    
+    sys.exit(asyncio.run(rebuild_metrics(args.check)))
@@ -0,0 +1,32 @@
+"""
+Re-score every employee's onboarding status from the base tables
+
+Usage:
+    python rescore_onboarding.py
+"""
+import asyncio
+import sys
+import time
+
+from app.database import create_db_and_tables, AsyncSessionLocal
+from app.services.onboarding_ai_service import OnboardingAIService
+
+
+async def rescore_onboarding() -> int:
+    """Recompute onboarding status for all employees without calling the LLM"""
+    await create_db_and_tables()
+    
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        summary = await OnboardingAIService().score_all_employees(session)
+    elapsed = time.perf_counter() - started
+    
+    changed = summary.pop("changed")
+    print(f"✅ Scored {sum(summary.values())} employee(s) in {elapsed:.2f}s, {changed} status change(s).")
+    for status, count in summary.items():
+        print(f"   └─ {status}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(rescore_onboarding()))
@@ -0,0 +1,112 @@
+"""
+Shared test fixtures
+Tests run against a throwaway SQLite database through aiosqlite, with AI in mock mode.
+"""
+import os
+import tempfile
+
+# Must be set before the app is imported, since the engine is created at import time
+_db_dir = tempfile.mkdtemp(prefix="hr-onboarding-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ["AI_MODE"] = "mock"
+
+from typing import List
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+from app.database import async_engine, AsyncSessionLocal
+from app.models.user import UserModel
+from app.models.task import TaskModel, EmployeeTaskModel
+from app.models.training import TrainingModuleModel, EmployeeTrainingModel
+from app.models.document import DocumentModel
+from app.core.enums import UserRole, TaskStatus, TaskType, DocumentType, VerificationStatus
+from app.services.metrics_rollup_service import MetricsRollupService
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests on asyncio only"""
+    return "asyncio"
+
+
+@pytest.fixture
+async def session():
+    """Fresh schema and a session on it"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    
+    async with AsyncSessionLocal() as db_session:
+        yield db_session
+    
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def queries():
+    """SQL statements executed while the test runs"""
+    statements: List[str] = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+async def seed_employees(session, count: int, tasks: int = 4, modules: int = 3) -> List[str]:
+    """
+    Create employees with a spread of tasks, training and documents
+    The metrics rollup is rebuilt afterwards, as migrations and services keep it in production.
+    Returns the employee IDs.
+    """
+    hr_user = UserModel(name="HR", email="hr@example.com", password_hash="x", role=UserRole.HR)
+    task_rows = [TaskModel(title=f"Task {i}", task_type=TaskType.READ, content="Read") for i in range(tasks)]
+    module_rows = [TrainingModuleModel(title=f"Module {i}", content="Learn") for i in range(modules)]
+    session.add_all([hr_user, *task_rows, *module_rows])
+    await session.flush()
+    
+    employees = [
+        UserModel(
+            name=f"Employee {i}",
+            email=f"employee{i}@example.com",
+            password_hash="x",
+            role=UserRole.EMPLOYEE,
+            is_active=i % 3 != 0
+        )
+        for i in range(count)
+    ]
+    session.add_all(employees)
+    await session.flush()
+    
+    for i, employee in enumerate(employees):
+        for j, task in enumerate(task_rows[:i % (tasks + 1)]):
+            session.add(EmployeeTaskModel(
+                employee_id=employee.id,
+                task_id=task.id,
+                status=TaskStatus.COMPLETED if j % 2 == 0 else TaskStatus.PENDING
+            ))
+        for j, module in enumerate(module_rows[:i % (modules + 1)]):
+            session.add(EmployeeTrainingModel(
+                employee_id=employee.id,
+                training_module_id=module.id,
+                status=TaskStatus.COMPLETED if j % 2 else TaskStatus.PENDING,
+                progress_percentage=50
+            ))
+        session.add(DocumentModel(
+            employee_id=employee.id,
+            document_type=DocumentType.PAN,
+            original_filename="pan.pdf",
+            file_path="/nonexistent/pan.pdf",
+            mime_type="application/pdf",
+            verification_status=VerificationStatus.PENDING,
+            verified_by=None,
+            task_id=None
+        ))
+    await session.commit()
+    
+    await MetricsRollupService.rebuild_all(session)
+    return [employee.id for employee in employees]
@@ -0,0 +1,91 @@
+"""
+Tests for single-flight Gemini requests and their cancellation
+"""
+import asyncio
+
+import pytest
+
+from app.core.ai_config import AIConfig
+from app.core.llm_cache import LLMCache
+from app.services.base_ai_service import BaseAIService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class SlowGeminiModel:
+    """Answers after a delay and records upstream calls and cancellations"""
+    
+    model_name = "fake"
+    
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.calls = 0
+        self.cancelled = 0
+    
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return FakeResponse('{"ok": true}')
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Live mode against a fake model, with no response cache and a fresh semaphore"""
+    fake = SlowGeminiModel()
+    monkeypatch.setattr(AIConfig, "_mock_mode", False)
+    monkeypatch.setattr(AIConfig, "_gemini_model", fake)
+    monkeypatch.setattr(AIConfig, "_llm_cache", LLMCache(ttl=0))
+    monkeypatch.setattr(AIConfig, "_gemini_semaphore", None)
+    yield fake
+    assert not BaseAIService._in_flight
+    assert not BaseAIService._waiters
+
+
+async def test_identical_prompts_share_one_request(model):
+    service = BaseAIService()
+    
+    results = await asyncio.gather(*[service.call_gemini("same prompt") for _ in range(3)])
+    
+    assert model.calls == 1
+    assert results == [{"ok": True}] * 3
+
+
+async def test_cancelling_sole_waiter_cancels_upstream_request(model):
+    service = BaseAIService()
+    semaphore = AIConfig.get_gemini_semaphore()
+    
+    caller = asyncio.create_task(service.call_gemini("abandoned prompt"))
+    await asyncio.sleep(0.05)
+    assert semaphore._value == AIConfig.max_concurrency - 1
+    
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    # Let the cancelled request unwind out of the semaphore
+    await asyncio.sleep(0.01)
+    
+    assert model.cancelled == 1
+    assert semaphore._value == AIConfig.max_concurrency
+    assert not BaseAIService._in_flight
+
+
+async def test_cancelling_one_of_several_waiters_keeps_request(model):
+    service = BaseAIService()
+    
+    leaving = asyncio.create_task(service.call_gemini("shared prompt"))
+    staying = asyncio.create_task(service.call_gemini("shared prompt"))
+    await asyncio.sleep(0.05)
+    
+    leaving.cancel()
+    assert await staying == {"ok": True}
+    assert model.calls == 1
+    assert model.cancelled == 0
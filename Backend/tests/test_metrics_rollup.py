@@ -0,0 +1,111 @@
+"""
+Metrics rollup tests
+Services keep the rollup in step with incremental deltas; after each write
+the stored rows must match a full recompute from the base tables.
+"""
+import io
+
+import pytest
+from sqlmodel import select
+from starlette.datastructures import Headers, UploadFile
+
+from app.models.task import TaskModel, EmployeeTaskModel
+from app.models.document import DocumentModel
+from app.core.enums import TaskStatus, VerificationStatus
+from app.services.metrics_rollup_service import MetricsRollupService
+from app.services.task_service import TaskService
+from app.services.document_service import DocumentService
+from app.services.employee_service import EmployeeService
+from .conftest import seed_employees
+
+pytestmark = pytest.mark.anyio
+
+
+async def assert_no_drift(session):
+    """Every stored rollup row matches the base tables"""
+    assert await MetricsRollupService.rebuild_all(session, fix=False) == []
+
+
+async def test_seeded_rollup_has_no_drift(session):
+    await seed_employees(session, 6)
+    
+    await assert_no_drift(session)
+
+
+async def test_complete_task_moves_pending_to_completed(session):
+    await seed_employees(session, 6)
+    assignment = (await session.execute(
+        select(EmployeeTaskModel).where(EmployeeTaskModel.status == TaskStatus.PENDING)
+    )).scalars().first()
+    before = await MetricsRollupService.get_metrics(session)
+    
+    await TaskService.complete_task(session, assignment.id, assignment.employee_id)
+    
+    after = await MetricsRollupService.get_metrics(session)
+    assert after["tasks_completed"] == before["tasks_completed"] + 1
+    assert after["tasks_pending"] == before["tasks_pending"] - 1
+    await assert_no_drift(session)
+
+
+async def test_delete_task_removes_its_assignments(session):
+    await seed_employees(session, 6)
+    task = (await session.execute(select(TaskModel))).scalars().first()
+    assigned = len((await session.execute(
+        select(EmployeeTaskModel).where(EmployeeTaskModel.task_id == task.id)
+    )).scalars().all())
+    before = await MetricsRollupService.get_metrics(session)
+    
+    await TaskService.delete_task(session, task.id)
+    
+    after = await MetricsRollupService.get_metrics(session)
+    assert assigned > 0
+    assert after["tasks_total"] == before["tasks_total"] - assigned
+    await assert_no_drift(session)
+
+
+async def test_upload_document_counts_as_pending(session, tmp_path):
+    employee_ids = await seed_employees(session, 3)
+    upload = UploadFile(
+        io.BytesIO(b"%PDF-1.4 resume"),
+        filename="resume.pdf",
+        headers=Headers({"content-type": "application/pdf"})
+    )
+    before = await MetricsRollupService.get_metrics(session, employee_ids[1])
+    
+    await DocumentService(tmp_path).upload_document(session, upload, "resume", employee_ids[1])
+    
+    after = await MetricsRollupService.get_metrics(session, employee_ids[1])
+    assert after["documents_total"] == before["documents_total"] + 1
+    assert after["documents_pending"] == before["documents_pending"] + 1
+    await assert_no_drift(session)
+
+
+@pytest.mark.parametrize("verification_status", [
+    VerificationStatus.VERIFIED,
+    VerificationStatus.REJECTED,
+])
+async def test_verify_document_moves_status_counter(session, tmp_path, verification_status):
+    await seed_employees(session, 3)
+    document = (await session.execute(select(DocumentModel))).scalars().first()
+    before = await MetricsRollupService.get_metrics(session)
+    
+    await DocumentService(tmp_path).verify_document(session, document.id, verification_status)
+    
+    after = await MetricsRollupService.get_metrics(session)
+    field = f"documents_{verification_status.value}"
+    assert after["documents_pending"] == before["documents_pending"] - 1
+    assert after[field] == before[field] + 1
+    assert after["documents_total"] == before["documents_total"]
+    await assert_no_drift(session)
+
+
+async def test_delete_employee_subtracts_from_global_row(session):
+    employee_ids = await seed_employees(session, 6)
+    removed = await MetricsRollupService.get_metrics(session, employee_ids[3])
+    before = await MetricsRollupService.get_metrics(session)
+    
+    await EmployeeService.delete_employee(session, employee_ids[3])
+    
+    after = await MetricsRollupService.get_metrics(session)
+    assert after == {field: before[field] - removed[field] for field in before}
+    await assert_no_drift(session)
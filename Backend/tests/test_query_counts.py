@@ -0,0 +1,52 @@
+"""
+Query-count regression tests
+Dashboard endpoints must run a fixed number of statements however many
+employees there are, so a change can't silently bring back per-row queries.
+"""
+import pytest
+
+from app.services.performance_service import PerformanceService
+from .conftest import seed_employees
+
+pytestmark = pytest.mark.anyio
+
+# Statements per call, independent of the number of employees
+OVERALL_PERFORMANCE_QUERIES = 1
+HR_DASHBOARD_QUERIES = 3
+EMPLOYEE_DASHBOARD_QUERIES = 1
+
+
+@pytest.mark.parametrize("employees", [5, 40])
+async def test_overall_performance_is_one_query(session, queries, employees):
+    await seed_employees(session, employees)
+    
+    queries.clear()
+    performance = await PerformanceService.get_overall_performance(session)
+    
+    assert len(queries) == OVERALL_PERFORMANCE_QUERIES
+    assert performance["total_employees"] == employees
+
+
+@pytest.mark.parametrize("employees", [5, 40])
+async def test_hr_dashboard_query_count_is_fixed(session, queries, employees):
+    await seed_employees(session, employees)
+    
+    queries.clear()
+    dashboard = await PerformanceService.get_dashboard_metrics(session, "hr", None)
+    
+    assert len(queries) == HR_DASHBOARD_QUERIES
+    assert dashboard["total_employees"] == employees
+    assert dashboard["pending_documents"] == employees
+
+
+@pytest.mark.parametrize("employees", [5, 40])
+async def test_employee_dashboard_query_count_is_fixed(session, queries, employees):
+    employee_ids = await seed_employees(session, employees)
+    
+    queries.clear()
+    dashboard = await PerformanceService.get_dashboard_metrics(session, "employee", employee_ids[3])
+    
+    assert len(queries) == EMPLOYEE_DASHBOARD_QUERIES
+    assert dashboard["total_tasks"] == 3
+    assert dashboard["completed_tasks"] == 2
+
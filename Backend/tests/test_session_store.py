@@ -0,0 +1,80 @@
+"""
+Refresh token session tests
+Tokens rotate on every use, and any rejected or revoked token must stay
+rejected even while its session is still held in the in-memory LRU.
+"""
+import pytest
+
+from app.core.session_store import SessionStore
+from .conftest import seed_employees
+
+pytestmark = pytest.mark.anyio
+
+
+def make_store() -> SessionStore:
+    """Store with its own LRU, so tests don't share cached sessions"""
+    return SessionStore(refresh_ttl=3600, cache_ttl=300, max_entries=100)
+
+
+@pytest.fixture
+async def user_id(session):
+    """An employee to own the sessions"""
+    employee_ids = await seed_employees(session, 1, tasks=0, modules=0)
+    return employee_ids[0]
+
+
+async def test_rotate_issues_a_new_token(session, user_id):
+    store = make_store()
+    token = await store.create(session, user_id)
+    
+    rotated = await store.rotate(session, token)
+    
+    assert rotated is not None
+    rotated_user_id, new_token = rotated
+    assert rotated_user_id == user_id
+    assert new_token != token
+    assert new_token.split(".")[0] == token.split(".")[0]
+    assert await store.rotate(session, new_token) is not None
+
+
+async def test_replaying_a_rotated_token_revokes_the_session(session, user_id):
+    store = make_store()
+    token = await store.create(session, user_id)
+    _, new_token = await store.rotate(session, token)
+    
+    assert await store.rotate(session, token) is None
+    
+    # The legitimate holder's current token is now dead too
+    assert await store.rotate(session, new_token) is None
+
+
+async def test_wrong_secret_is_rejected(session, user_id):
+    store = make_store()
+    token = await store.create(session, user_id)
+    session_id = token.split(".")[0]
+    
+    assert await store.rotate(session, f"{session_id}.not-the-secret") is None
+    assert await store.rotate(session, session_id) is None
+    assert await store.revoke(session, f"{session_id}.not-the-secret") is False
+
+
+async def test_logout_revokes_the_token(session, user_id):
+    store = make_store()
+    token = await store.create(session, user_id)
+    
+    assert await store.revoke(session, token, user_id=user_id) is True
+    
+    assert await store.rotate(session, token) is None
+
+
+async def test_revoke_user_applies_despite_cached_entry(session, user_id):
+    store = make_store()
+    token = await store.create(session, user_id)
+    session_id = token.split(".")[0]
+    
+    # Revoked through another process's store, so this one's LRU is not invalidated
+    await make_store().revoke_user(session, user_id)
+    await session.commit()
+    
+    assert store._cache.get(session_id) is not None
+    assert await store.rotate(session, token) is None